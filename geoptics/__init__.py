@@ -25,10 +25,6 @@ logger = logging.getLogger(__name__)   # noqa: E402
 # FIXME: this should be done in the application files. How ?
 #logger.setLevel(logging.DEBUG)
 logger.setLevel(logging.WARNING)
-# this is a basic handler, with output to stderr
-logger_handler = logging.StreamHandler()
-formatter = logging.Formatter('%(name)s - %(levelname)s - %(message)s')
-logger_handler.setFormatter(formatter)
-del formatter
-logger.addHandler(logger_handler)
-del logger_handler
+# library default, handlers are left to the application
+# (the command line one is set in __main__.main)
+logger.addHandler(logging.NullHandler())
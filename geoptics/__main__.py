@@ -32,7 +32,9 @@ cf. http://stackoverflow.com/questions/3411293/using-modules-own-objects-in-main
 """
 
 import argparse
+import logging
 
+from geoptics import logger
 from geoptics.guis.qt import main as qtgui
 
 
@@ -48,6 +50,12 @@ def main():
 	    print("version")
 	    return
 	
+	# this is a basic handler, with output to stderr
+	logger_handler = logging.StreamHandler()
+	formatter = logging.Formatter('%(name)s - %(levelname)s - %(message)s')
+	logger_handler.setFormatter(formatter)
+	logger.addHandler(logger_handler)
+	
 	gui = qtgui.Gui()
 
 	# don't know why yet, but setting scenerect fixes the combined move bug
@@ -96,13 +96,35 @@ In user scripts, this is not useful, and the previous way is preferred.
 """
 
 
-import os
+import sys
 from importlib import import_module
 
 
-# import all modules in this subpackage directory
+# submodules reachable as attributes of this package
 # This allows the other route explained in "Submodules imports" above.
-for filename in os.listdir(os.path.dirname(__file__)):
-	if filename[-3:] == ".py" and filename != "__init__.py":
-		module_name = filename[:-3]
-		import_module(".{}".format(module_name), "geoptics.elements")
+_SUBMODULES = (
+    'arc',
+    'bvh',
+    'line',
+    'rays',
+    'rays_batch',
+    'regions',
+    'scene',
+    'segment',
+    'sources',
+    'vector',
+)
+
+
+def __getattr__(name):
+	"""Import submodules on first access (PEP 562)."""
+	if name in _SUBMODULES:
+		return import_module(".{}".format(name), __name__)
+	raise AttributeError(
+	    "module {!r} has no attribute {!r}".format(__name__, name))
+
+
+if sys.version_info < (3, 7):
+	# module __getattr__ is not supported, import everything right now
+	for _name in _SUBMODULES:
+		import_module(".{}".format(_name), __name__)
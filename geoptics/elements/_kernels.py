@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 ederag <edera@gmx.fr>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GeOptics; see the file LICENSE.txt.  If not, see
+# <http://www.gnu.org/licenses/>.
+
+
+"""Geometry kernels, working on plain floats.
+
+These free functions hold the arithmetic of the hot intersection methods,
+without any object allocation.
+They are compiled with numba_ when it is available
+(numba is optional, the pure python versions are used otherwise).
+
+The geometry arrays fed to the kernels use :data:`DTYPE`,
+double precision unless the ``GEOPTICS_PRECISION`` environment variable
+is set to ``fp32`` (halving the memory traffic, at the cost of precision).
+
+.. _numba: https://numba.pydata.org/
+"""
+
+
+import os
+from math import hypot, sqrt
+
+import numpy as np
+
+try:
+	from numba import njit
+except ImportError:
+	njit = None
+
+try:
+	# python >= 3.13
+	from math import fma
+except ImportError:
+	fma = None
+
+
+#: numba compilation options
+# (njit implies nopython=True)
+NJIT_KW = dict(nogil=True, fastmath=True, cache=True)
+
+#: True if the kernels are compiled
+JIT_ENABLED = njit is not None
+
+#: dtype of the geometry arrays
+DTYPE = (np.float32 if os.environ.get('GEOPTICS_PRECISION') == 'fp32'
+         else np.float64)
+
+
+def _jit(func):
+	"""Compile `func` with numba, if available."""
+	if njit is None:
+		return func
+	return njit(**NJIT_KW)(func)
+
+
+if fma is not None and njit is None:
+	# (numba does not compile math.fma)
+	def _dot(ax, bx, ay, by):
+		"""Return ``ax * bx + ay * by``, with a single final rounding."""
+		return fma(ax, bx, ay * by)
+else:
+	@_jit
+	def _dot(ax, bx, ay, by):
+		"""Return ``ax * bx + ay * by``."""
+		return ax * bx + ay * by
+
+
+@_jit
+def arc_line_roots(ox, oy, ux, uy, cx, cy, r):
+	"""Intersections between a line and a circle.
+	
+	Args:
+		ox, oy (float): line reference point
+		ux, uy (float): line direction vector
+		cx, cy (float): circle center
+		r (float): circle radius
+	
+	Returns:
+		:obj:`tuple`: ``(s1, s2, count)``,
+			with `count` the number of meaningful roots (0, 1 or 2),
+			`s1` and `s2` the line multipliers of the intersections.
+	
+	"""
+	a = ux * ux + uy * uy
+	if a == 0:
+		return 0.0, 0.0, 0
+	# center to reference point
+	dx = ox - cx
+	dy = oy - cy
+	b = _dot(ux, dx, uy, dy)
+	c = dx * dx + dy * dy - r * r
+	# reduced discriminant
+	delta = b * b - a * c
+	if delta > 0:
+		# this way is numerically more stable (?)
+		if b >= 0:
+			q = -b - sqrt(delta)
+		else:
+			q = -b + sqrt(delta)
+		# two roots
+		return q / a, c / q, 2
+	elif delta == 0:
+		# one root
+		return -b / a, 0.0, 1
+	else:
+		return 0.0, 0.0, 0
+
+
+@_jit
+def line_line_s(px, py, ux, uy, qx, qy, vx, vy):
+	"""Intersection between two lines.
+	
+	Args:
+		px, py (float): first line reference point
+		ux, uy (float): first line direction vector
+		qx, qy (float): second line reference point
+		vx, vy (float): second line direction vector
+	
+	Returns:
+		:obj:`tuple`: ``(s, ok)``,
+			`ok` being `False` for colinear lines.
+			Otherwise, the intersection is at ``q + s * v``.
+	
+	"""
+	det = vx * uy - vy * ux
+	if det == 0:
+		return 0.0, False
+	return ((px - qx) * uy - (py - qy) * ux) / det, True
+
+
+@_jit
+def line_box_range(px, py, ux, uy, xmin, ymin, xmax, ymax):
+	"""Range of a line inside an axis-aligned box (slab test).
+	
+	Args:
+		px, py (float): line reference point
+		ux, uy (float): line direction vector
+		xmin, ymin, xmax, ymax (float): box limits
+	
+	Returns:
+		:obj:`tuple`: ``(smin, smax)``,
+			the line being inside the box for ``smin <= s <= smax``.
+			``smin > smax`` if the line misses the box.
+	
+	"""
+	inf = float("inf")
+	if ux != 0:
+		s1 = (xmin - px) / ux
+		s2 = (xmax - px) / ux
+		smin = min(s1, s2)
+		smax = max(s1, s2)
+	elif xmin <= px <= xmax:
+		smin = -inf
+		smax = inf
+	else:
+		return inf, -inf
+	if uy != 0:
+		s1 = (ymin - py) / uy
+		s2 = (ymax - py) / uy
+		smin = max(smin, min(s1, s2))
+		smax = min(smax, max(s1, s2))
+	elif not ymin <= py <= ymax:
+		return inf, -inf
+	return smin, smax
+
+
+@_jit
+def seg_line_intersect(x1, y1, x2, y2, px, py, ux, uy, sign_of_s):
+	"""Intersection between a segment and a line.
+	
+	Same result as :meth:`.Segment.intersection`.
+	
+	Args:
+		x1, y1, x2, y2 (float): segment end points
+		px, py (float): line reference point
+		ux, uy (float): line direction vector
+		sign_of_s (int): same as in :meth:`.Segment.intersection`
+	
+	Returns:
+		:obj:`tuple`: ``(hit, mx, my, s, eNx, eNy, eTx, eTy)``,
+			`hit` being `False` if there is no intersection.
+	
+	"""
+	dx = x2 - x1
+	dy = y2 - y1
+	# axis aligned segments: a single equation, as in Segment
+	# (the same arithmetic, hence the same results)
+	if dx == 0 and dy != 0:
+		if ux == 0:
+			return False, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+		s = (x1 - px) / ux
+		ok = True
+	elif dy == 0 and dx != 0:
+		if uy == 0:
+			return False, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+		s = (y1 - py) / uy
+		ok = True
+	else:
+		s, ok = line_line_s(x1, y1, dx, dy, px, py, ux, uy)
+	# s == 0 is always rejected, as in Line.intersection
+	if not ok or s == 0 or s * sign_of_s < 0:
+		return False, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+	mx = px + s * ux
+	my = py + s * uy
+	# bounds check on the coordinate closer to the segment direction
+	if abs(dx) > abs(dy):
+		if mx < min(x1, x2) or mx > max(x1, x2):
+			return False, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+	else:
+		if my < min(y1, y2) or my > max(y1, y2):
+			return False, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+	inv_norm = 1.0 / hypot(dx, dy)
+	eTx = dx * inv_norm
+	eTy = dy * inv_norm
+	return True, mx, my, s, eTy, -eTx, eTx, eTy
+
+
+@_jit
+def segments_line_intersect(x1, y1, x2, y2, px, py, ux, uy, sign_of_s, out):
+	"""Intersections between many segments and a line.
+	
+	Args:
+		x1, y1, x2, y2 (ndarray): segments end points
+		px, py, ux, uy, sign_of_s: same as in :func:`seg_line_intersect`
+		out (ndarray):
+			array of shape ``(len(x1), 7)``, filled with the
+			``(mx, my, s, eNx, eNy, eTx, eTy)`` rows of the intersections.
+	
+	Returns:
+		int: the number of intersections (filled rows of `out`)
+	
+	"""
+	count = 0
+	for i in range(x1.shape[0]):
+		hit, mx, my, s, eNx, eNy, eTx, eTy = seg_line_intersect(
+		    x1[i], y1[i], x2[i], y2[i], px, py, ux, uy, sign_of_s)
+		if hit:
+			out[count, 0] = mx
+			out[count, 1] = my
+			out[count, 2] = s
+			out[count, 3] = eNx
+			out[count, 4] = eNy
+			out[count, 5] = eTx
+			out[count, 6] = eTy
+			count += 1
+	return count
+
+
+@_jit
+def pnpoly(y1, y2, slope, intercept, px, py):
+	"""Crossing number test, for a point in a polygon.
+	
+	Args:
+		y1, y2 (ndarray): ordinates of the edges end points
+		slope, intercept (ndarray):
+			the edges cross the horizontal line at ordinate `y`
+			at ``x = slope * y + intercept``
+		px, py (float): the point
+	
+	Returns:
+		bool: `True` if the point is inside the polygon
+	
+	"""
+	inside = False
+	for i in range(y1.shape[0]):
+		# branchless parity accumulation
+		inside ^= (((y1[i] > py) != (y2[i] > py))
+		           & (px < slope[i] * py + intercept[i]))
+	return inside
+
+
+@_jit
+def parts_ends(data, out):
+	"""End points of ray parts.
+	
+	Args:
+		data (ndarray): one ``(px, py, ux, uy, s)`` row per part
+		out (ndarray):
+			array of shape ``(len(data), 2)``,
+			filled with the ``(x, y)`` end points ``p + s * u``
+	
+	"""
+	for i in range(data.shape[0]):
+		s = data[i, 4]
+		out[i, 0] = data[i, 0] + data[i, 2] * s
+		out[i, 1] = data[i, 1] + data[i, 3] * s
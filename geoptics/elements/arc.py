@@ -20,11 +20,14 @@
 """Define an arc of a circle."""
 
 
-from math import sqrt
+from math import hypot
 
-from geoptics.elements.vector import Vector_M1M2
+import numpy as np
 
-from .line import Intersection, Line
+from geoptics.elements.vector import Point, Vector, Vector_M1M2
+
+from ._kernels import arc_line_roots
+from .line import Line
 
 
 class Arc(object):
@@ -34,17 +37,37 @@ class Arc(object):
 		M1 (Point): starting point
 		M2 (Point): ending point
 		tangent (Vector): tangent to the arc at the starting point M1
+		_copy (bool):
+			if `False`, keep the given objects instead of copies.
+			Only for callers that do not keep any other reference to them.
 	"""
 	
-	def __init__(self, M1, M2, tangent):
-		self.M1 = M1.copy()
-		self.M2 = M2.copy()
-		self.tangent = tangent.copy()
+	def __init__(self, M1, M2, tangent, _copy=True):
+		if _copy:
+			self.M1 = M1.copy()
+			self.M2 = M2.copy()
+			self.tangent = tangent.copy()
+		else:
+			self.M1 = M1
+			self.M2 = M2
+			self.tangent = tangent
 		self.C = self.center()
-		self.r = self.radius()
+		self.r = self._compute_radius()
 		self.theta1 = Vector_M1M2(self.C, self.M1).theta_x()
 		self.theta2 = Vector_M1M2(self.C, self.M2).theta_x()
-		self.ccw = self._get_ccw()
+		self.ccw = self._compute_ccw()
+		# C to M1 and C to M2 vectors, for the sector test
+		# (unchanged by translations)
+		self._cm1x = self.M1.x - self.C.x
+		self._cm1y = self.M1.y - self.C.y
+		self._cm2x = self.M2.x - self.C.x
+		self._cm2y = self.M2.y - self.C.y
+		# angles are counted positive in the arc direction
+		self._sign = 1.0 if self.ccw else -1.0
+		# arc spanning less than a half-turn ?
+		self._minor = (
+		    self._sign * (self._cm1x * self._cm2y - self._cm1y * self._cm2x)
+		    >= 0)
 	
 	def center(self):
 		"""Return the arc center."""
@@ -58,7 +81,7 @@ class Arc(object):
 		# normally there should be only one intersection
 		# there should be only one intersection
 		intersection, = Line(Mm, Vch).intersection(Line(self.M1, Vtg))
-		C = intersection.p
+		C = intersection[0]
 		return C
 	
 	@property
@@ -70,11 +93,19 @@ class Arc(object):
 		        'tangent': self.tangent.config,
 		        }
 	
-	def radius(self):
-		"""Return the arc radius of curvature."""
-		return Vector_M1M2(self.M1, self.center()).norm()
+	def copy(self):
+		"""Return an independent copy."""
+		return Arc(self.M1.copy(), self.M2.copy(), self.tangent.copy(),
+		           _copy=False)
+	
+	def _compute_radius(self):
+		"""Return the arc radius of curvature.
+		
+		The center `self.C` must have been computed already.
+		"""
+		return hypot(self.M1.x - self.C.x, self.M1.y - self.C.y)
 	
-	def _get_ccw(self):
+	def _compute_ccw(self):
 		"""Return true if the arc goes from M1 to M2 ccw."""
 		CM1 = Vector_M1M2(self.C, self.M1)
 		return ((CM1.x * self.tangent.y - CM1.y * self.tangent.x) > 0)
@@ -83,19 +114,37 @@ class Arc(object):
 		"""Return `True` if the point M belongs to the arc sector.
 		
 		Distances are not checked.
+		
+		Uses cross products with CM1 and CM2 (no trigonometry).
 		"""
-		theta_i = Vector_M1M2(self.C, M).theta_x()
-		if self.theta2 < self.theta1:
-			if self.theta2 < theta_i < self.theta1:
-				return not self.ccw
-			else:
-				return self.ccw
+		dx = M.x - self.C.x
+		dy = M.y - self.C.y
+		# > 0 if CM is after CM1, in the arc direction
+		cross1 = self._sign * (self._cm1x * dy - self._cm1y * dx)
+		# < 0 if CM is before CM2, in the arc direction
+		cross2 = self._sign * (self._cm2x * dy - self._cm2y * dx)
+		if self._minor:
+			return cross1 > 0 and cross2 < 0
 		else:
-			if self.theta1 < theta_i < self.theta2:
-				return self.ccw
-			else:
-				return not self.ccw
+			return cross1 > 0 or cross2 < 0
 					
+	def bbox(self):
+		"""Return the bounding box ``(xmin, ymin, xmax, ymax)``.
+		
+		The box holds the end points,
+		and the extreme points of the circle belonging to the arc.
+		"""
+		xs = [self.M1.x, self.M2.x]
+		ys = [self.M1.y, self.M2.y]
+		cx, cy = self.C
+		r = self.r
+		for dx, dy in ((r, 0), (0, r), (-r, 0), (0, -r)):
+			M = Point(cx + dx, cy + dy)
+			if M in self:
+				xs.append(M.x)
+				ys.append(M.y)
+		return min(xs), min(ys), max(xs), max(ys)
+	
 	def intersection(self, other, sign_of_s=0):
 		"""Intersections of the arc with another element.
 		
@@ -107,52 +156,103 @@ class Arc(object):
 				as `sign_of_s` or intersection will be empty
 		
 		Returns:
-			:obj:`list` of :class:`.Intersection`: list of intersections
+			:obj:`list` of :class:`.Intersection`-like tuples:
+				list of intersections
 		
 		"""
 		result = []
 		if isinstance(other, Line):
-			s_list = []
-			a = other.u.x ** 2 + other.u.y ** 2
-			if a != 0:
-				b = (other.u.x * (other.p.x - self.C.x)
-				     + other.u.y * (other.p.y - self.C.y)
-				     )
-				c = ((other.p.x - self.C.x) ** 2
-				     + (other.p.y - self.C.y) ** 2
-				     - self.r ** 2
-				     )
-				# reduced discriminant
-				delta = b ** 2 - a * c
-				# compute roots
-				if delta > 0:
-					# this way is numerically more stable (?)
-					if b >= 0:
-						q = -b - sqrt(delta)
-					else:
-						q = -b + sqrt(delta)
-					# two roots
-					s1 = q / a
-					s2 = c / q
-					s_list.extend([s1, s2])
-				elif delta == 0:
-					# one root
-					s = -b / a
-					s_list.append(s)
-			for s in s_list:
-				# intersection point
-				M = other.point(s)
-				if (M in self) and (s * sign_of_s >= 0):
-					# normal is \vec{CM}/CM
-					eN = Vector_M1M2(self.C, M).normalize()
-					# tangent is orthogonal to normal for a circle
-					eT = eN.normal(normalized=True)
-					result.append(Intersection(M, s, eN, eT))
+			s1, s2, count = arc_line_roots(other.p.x, other.p.y,
+			                               other.u.x, other.u.y,
+			                               self.C.x, self.C.y, self.r)
+			if count:
+				self._emit_root(s1, other, sign_of_s, result)
+				if count == 2:
+					self._emit_root(s2, other, sign_of_s, result)
 		else:
 			raise NotImplementedError(
 			            "intersection between Line and {}".format(type(other)))
 		return result
 	
+	def intersection_forward(self, other):
+		"""Same as :meth:`intersection` with ``sign_of_s=1``."""
+		return self.intersection(other, 1)
+	
+	def _emit_root(self, s, other, sign_of_s, result):
+		"""Append the intersection at `other.point(s)` to `result`.
+		
+		Only if the point belongs to the arc,
+		and if `s` has the right sign.
+		"""
+		if s * sign_of_s >= 0:
+			# intersection point
+			M = other.point(s)
+			if M in self:
+				# normal is \vec{CM}/CM, with CM = r
+				inv_r = 1.0 / self.r
+				eNx = (M.x - self.C.x) * inv_r
+				eNy = (M.y - self.C.y) * inv_r
+				# tangent is orthogonal to normal for a circle
+				# (same orientation as eN.normal())
+				result.append((M, s, Vector(eNx, eNy), Vector(eNy, -eNx)))
+	
+	def intersect_batch(self, px, py, ux, uy, sign_of_s=0):
+		"""Intersections of the arc with many lines at once.
+		
+		Vectorized version of :meth:`intersection`.
+		
+		Args:
+			px, py (ndarray): coordinates of the lines reference points
+			ux, uy (ndarray): coordinates of the lines direction vectors
+			sign_of_s (int): same as in :meth:`intersection`
+		
+		Returns:
+			:obj:`tuple` of ndarray:
+				``(s, eNx, eNy, eTx, eTy)``, each of shape ``(2, len(px))``,
+				since a line can cross a circle twice.
+				`s` is set to `inf` for missing intersections.
+		
+		"""
+		cx, cy = self.C
+		# center to reference points
+		dx = px - cx
+		dy = py - cy
+		a = ux * ux + uy * uy
+		b = ux * dx + uy * dy
+		c = dx * dx + dy * dy - self.r * self.r
+		# reduced discriminant
+		delta = b * b - a * c
+		with np.errstate(divide='ignore', invalid='ignore'):
+			sqrt_delta = np.sqrt(np.where(delta > 0, delta, 0))
+			# same numerically stable choice as in intersection()
+			q = np.where(b >= 0, -b - sqrt_delta, -b + sqrt_delta)
+			two_roots = (delta > 0) & (a != 0)
+			one_root = (delta == 0) & (a != 0)
+			s1 = np.where(two_roots, q / a, np.where(one_root, -b / a, np.inf))
+			s2 = np.where(two_roots, c / q, np.inf)
+			s = np.stack((s1, s2))
+			# intersection points
+			Mx = px + s * ux
+			My = py + s * uy
+			# same sector test as in __contains__
+			cross1 = self._sign * (self._cm1x * (My - cy)
+			                       - self._cm1y * (Mx - cx))
+			cross2 = self._sign * (self._cm2x * (My - cy)
+			                       - self._cm2y * (Mx - cx))
+			if self._minor:
+				in_arc = (cross1 > 0) & (cross2 < 0)
+			else:
+				in_arc = (cross1 > 0) | (cross2 < 0)
+		valid = np.isfinite(s) & in_arc & (s * sign_of_s >= 0)
+		s = np.where(valid, s, np.inf)
+		# normal is \vec{CM}/CM, with CM = r
+		inv_r = 1.0 / self.r
+		with np.errstate(invalid='ignore'):
+			eNx = np.where(valid, (Mx - cx) * inv_r, 0)
+			eNy = np.where(valid, (My - cy) * inv_r, 0)
+		# tangent is orthogonal to normal for a circle
+		return s, eNx, eNy, eNy, -eNx
+	
 	def __repr__(self):
 		return "Arc({M1}, {M2}, {tangent})".format(**vars(self))
 	
@@ -164,7 +264,6 @@ class Arc(object):
 		
 		Likewise, it is possible to
 		insert a `.copy()` to avoid side-effects.
-		FIXME: copy() not implemented yet...
 		
 		Returns:
 			`self`, for convenience
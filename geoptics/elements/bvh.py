@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 ederag <edera@gmx.fr>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GeOptics; see the file LICENSE.txt.  If not, see
+# <http://www.gnu.org/licenses/>.
+
+
+"""Bounding volume hierarchies, over axis-aligned bounding boxes.
+
+Used to skip quickly the items (curves of a region, regions of a scene)
+that can not be crossed by a line, or can not hold a point.
+Boxes are ``(xmin, ymin, xmax, ymax)`` tuples.
+"""
+
+
+from typing import List, NamedTuple, Tuple
+
+from ._kernels import line_box_range
+
+
+#: maximum number of items in a BVH leaf
+LEAF_SIZE = 2
+
+
+class BVH(NamedTuple):
+	"""Bounding volume hierarchy, as returned by :func:`build_bvh`.
+	
+	The nodes are stored in flat lists, the root being node 0.
+	"""
+	
+	#: bounding box of each item
+	item_box: List[Tuple[float, float, float, float]]
+	#: bounding box of each node
+	box: List[Tuple[float, float, float, float]]
+	#: left child of each node, -1 for leaves
+	left: List[int]
+	#: right child of each node, -1 for leaves
+	right: List[int]
+	#: index in `order` of the first item of each leaf
+	first: List[int]
+	#: number of items of each leaf
+	count: List[int]
+	#: item indices, grouped by leaf
+	order: List[int]
+	
+	def crossed(self, line, sign_of_s=0):
+		"""Return the indices of the items whose box is crossed by `line`.
+		
+		Args:
+			line (Line): the line
+			sign_of_s (int): same as in :meth:`.Segment.intersection`
+		"""
+		result = []
+		if not self.item_box:
+			return result
+		stack = [0]
+		while stack:
+			node = stack.pop()
+			if not line_hits_box(line, self.box[node], sign_of_s):
+				continue
+			if self.left[node] < 0:
+				# leaf
+				first = self.first[node]
+				for k in self.order[first:first + self.count[node]]:
+					if line_hits_box(line, self.item_box[k], sign_of_s):
+						result.append(k)
+			else:
+				stack.append(self.right[node])
+				stack.append(self.left[node])
+		return result
+	
+	def crossed_by_entry(self, line, sign_of_s=0):
+		"""Same as :meth:`crossed`, front to back.
+		
+		Returns:
+			:obj:`list` of :obj:`tuple`: ``(s_entry, k)`` items,
+				sorted by `s_entry`, the `s` value where `line`
+				enters the box of item `k`.
+		"""
+		p = line.p
+		u = line.u
+		result = []
+		for k in self.crossed(line, sign_of_s):
+			s_entry = line_box_range(p.x, p.y, u.x, u.y, *self.item_box[k])[0]
+			if sign_of_s > 0:
+				s_entry = max(s_entry, 0)
+			result.append((s_entry, k))
+		result.sort()
+		return result
+	
+	def containing(self, x, y):
+		"""Return the indices of the items whose box holds ``(x, y)``."""
+		result = []
+		if not self.item_box:
+			return result
+		stack = [0]
+		while stack:
+			node = stack.pop()
+			xmin, ymin, xmax, ymax = self.box[node]
+			if not (xmin <= x <= xmax and ymin <= y <= ymax):
+				continue
+			if self.left[node] < 0:
+				# leaf
+				first = self.first[node]
+				for k in self.order[first:first + self.count[node]]:
+					xmin, ymin, xmax, ymax = self.item_box[k]
+					if xmin <= x <= xmax and ymin <= y <= ymax:
+						result.append(k)
+			else:
+				stack.append(self.right[node])
+				stack.append(self.left[node])
+		return result
+
+
+def union(boxes):
+	"""Return the bounding box of several boxes."""
+	xmins, ymins, xmaxs, ymaxs = zip(*boxes)
+	return min(xmins), min(ymins), max(xmaxs), max(ymaxs)
+
+
+def enlarge(box):
+	"""Return the box slightly enlarged, to be safe against roundoff errors."""
+	xmin, ymin, xmax, ymax = box
+	margin = 1e-9 * (1 + max(xmax - xmin, ymax - ymin,
+	                         abs(xmin), abs(ymin), abs(xmax), abs(ymax)))
+	return xmin - margin, ymin - margin, xmax + margin, ymax + margin
+
+
+def build_bvh(boxes):
+	"""Build a :class:`BVH` over the given boxes.
+	
+	Top-down construction, splitting each node in the middle of
+	the longest axis of its box centers.
+	"""
+	bvh = BVH(list(boxes), [], [], [], [], [], list(range(len(boxes))))
+	order = bvh.order
+	centers = [((xmin + xmax) / 2, (ymin + ymax) / 2)
+	           for xmin, ymin, xmax, ymax in boxes]
+	
+	def build(first, count):
+		index = len(bvh.box)
+		indices = order[first:first + count]
+		bvh.box.append(union([boxes[k] for k in indices]))
+		bvh.left.append(-1)
+		bvh.right.append(-1)
+		bvh.first.append(first)
+		bvh.count.append(count)
+		if count <= LEAF_SIZE:
+			return index
+		cxs = [centers[k][0] for k in indices]
+		cys = [centers[k][1] for k in indices]
+		if max(cxs) - min(cxs) >= max(cys) - min(cys):
+			axis = 0
+			middle = (min(cxs) + max(cxs)) / 2
+		else:
+			axis = 1
+			middle = (min(cys) + max(cys)) / 2
+		below = [k for k in indices if centers[k][axis] < middle]
+		above = [k for k in indices if centers[k][axis] >= middle]
+		if not below or not above:
+			# all centers on the middle, split in two halves
+			indices.sort(key=lambda k: centers[k][axis])
+			half = count // 2
+			below, above = indices[:half], indices[half:]
+		order[first:first + count] = below + above
+		bvh.left[index] = build(first, len(below))
+		bvh.right[index] = build(first + len(below), len(above))
+		return index
+	
+	if boxes:
+		build(0, len(boxes))
+	return bvh
+
+
+def translated(bvh, dx, dy):
+	"""Return the `bvh` translated by ``(dx, dy)``.
+	
+	The hierarchy is kept, only the boxes are moved.
+	"""
+	def move(boxes):
+		return [(xmin + dx, ymin + dy, xmax + dx, ymax + dy)
+		        for xmin, ymin, xmax, ymax in boxes]
+	
+	return bvh._replace(item_box=move(bvh.item_box), box=move(bvh.box))
+
+
+def line_hits_box(line, box, sign_of_s):
+	"""Return `True` if `line` may cross the `box`.
+	
+	Args:
+		line (Line): the line
+		box (tuple): ``(xmin, ymin, xmax, ymax)``
+		sign_of_s (int): same as in :meth:`.Segment.intersection`
+	"""
+	smin, smax = line_box_range(line.p.x, line.p.y, line.u.x, line.u.y, *box)
+	if sign_of_s > 0:
+		smin = max(smin, 0)
+	elif sign_of_s < 0:
+		smax = min(smax, 0)
+	return smin <= smax
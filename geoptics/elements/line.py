@@ -20,14 +20,23 @@
 """Define :term:`Lines`."""
 
 
+from math import acos, hypot, pi
 from typing import NamedTuple
-from math import cos, pi, sin
+
+import numpy as np
 
 from geoptics.elements.vector import Point, Vector
 
+from ._kernels import line_line_s
+
 
 class Intersection(NamedTuple):
-	"""Intersection between a :class:`Line` and another element"""
+	"""Intersection between a :class:`Line` and another element
+	
+	This describes the fields of the intersections.
+	For speed, the ``intersection`` methods return plain tuples
+	``(p, s, eN, eT)``, with the same layout.
+	"""
 	
 	#: point of intersection
 	p: Point
@@ -48,6 +57,8 @@ class Line(object):
 	
 	"""
 	
+	__slots__ = ('p', 'u')
+	
 	def __init__(self, p=None, u=None):
 		if p is None:
 			self.p = Point(x=0, y=0)
@@ -58,6 +69,18 @@ class Line(object):
 		else:
 			self.u = u.copy()
 	
+	@classmethod
+	def _take(cls, p, u):
+		"""Alternate constructor, without copies.
+		
+		`p` and `u` are stored as is, to be used only
+		when the caller does not keep any other reference to them.
+		"""
+		line = cls.__new__(cls)
+		line.p = p
+		line.u = u
+		return line
+	
 	@property
 	def config(self):  # noqa: D401
 		"""Configuration dictionary."""
@@ -67,7 +90,7 @@ class Line(object):
 	
 	def copy(self):
 		"""Return an independent copy."""
-		return Line(self.p, self.u)
+		return Line._take(self.p.copy(), self.u.copy())
 	
 	@classmethod
 	def from_config(cls, config):
@@ -137,7 +160,7 @@ class Line(object):
 				same sign as `sign_of_s`.
 		
 		Returns:
-			:obj:`list` of :class:`Intersection`:
+			:obj:`list` of :class:`Intersection`-like tuples:
 				list either empty (no intersection),
 				or holding a single intersection.
 				
@@ -145,29 +168,51 @@ class Line(object):
 				can have multiple intersections with a line.
 		
 		"""
-		if isinstance(other, Line):
-			if other.u.colinear(self.u):
-				result = []
-			else:
-				s = (
-				     (
-				      (self.p.x - other.p.x) * self.u.y
-				      - (self.p.y - other.p.y) * self.u.x
-				     )
-				     / (other.u.x * self.u.y - other.u.y * self.u.x)
-				    )
-				if (sign_of_s == 0 and s != 0) or (s * sign_of_s > 0):
-					Mi = Point(other.p.x + s * other.u.x,
-					           other.p.y + s * other.u.y)
-					eN = self.normal(normalized=True)
-					eT = self.tangent(normalized=True)
-					result = [Intersection(Mi, s, eN, eT)]
-				else:
-					result = []
-		else:
+		if sign_of_s == 0:
+			return self.intersection_bidir(other)
+		elif sign_of_s > 0:
+			return self.intersection_forward(other)
+		s, ok = self._line_s(other)
+		if ok and s * sign_of_s > 0:
+			return [self._hit(other, s)]
+		return []
+	
+	def intersection_forward(self, other):
+		"""Intersections with `other` considered as a half line.
+		
+		Same as :meth:`intersection` with ``sign_of_s=1``,
+		without the sign dispatch, for the propagation loop.
+		"""
+		s, ok = self._line_s(other)
+		if ok and s > 0:
+			return [self._hit(other, s)]
+		return []
+	
+	def intersection_bidir(self, other):
+		"""Same as :meth:`intersection` with ``sign_of_s=0``."""
+		s, ok = self._line_s(other)
+		if ok and s != 0:
+			return [self._hit(other, s)]
+		return []
+	
+	def _line_s(self, other):
+		"""Return ``(s, ok)``, `ok` being `False` for colinear lines."""
+		if not isinstance(other, Line):
 			raise NotImplementedError(
 			             "intersection between Line and {}".format(type(other)))
-		return result
+		return line_line_s(self.p.x, self.p.y, self.u.x, self.u.y,
+		                   other.p.x, other.p.y, other.u.x, other.u.y)
+	
+	def _hit(self, other, s):
+		"""Build the intersection tuple, at ``other.point(s)``."""
+		Mi = Point(other.p.x + s * other.u.x,
+		           other.p.y + s * other.u.y)
+		# same as normal() and tangent(), with a single norm computation
+		ux, uy = self.u
+		inv_norm = 1.0 / hypot(ux, uy)
+		ux *= inv_norm
+		uy *= inv_norm
+		return (Mi, s, Vector(uy, -ux), Vector(ux, uy))
 	
 	@staticmethod
 	def interpolate(line_start, line_end, x):
@@ -189,15 +234,65 @@ class Line(object):
 		
 		"""
 		
-		p = (1 - x) * line_start.p + x * line_end.p
-		angle_start = line_start.u.theta_x()
-		angle_end = line_end.u.theta_x()
-		if angle_end < angle_start:
-			# we want to go ccw from start to end
-			angle_end += 2 * pi
-		angle = (1 - x) * angle_start + x * angle_end
-		u = Vector(x=cos(angle), y=sin(angle))
-		return Line(p=p, u=u)
+		line, = Line.interpolate_many(line_start, line_end, (x,))
+		return line
+	
+	@staticmethod
+	def interpolate_many(line_start, line_end, xs):
+		"""Interpolated lines, for several fractions.
+		
+		Same as :meth:`interpolate` for each `x` in `xs`,
+		but what depends only on the two lines is computed once.
+		
+		Args:
+			line_start (Line): The starting line.
+			line_end (Line): The ending line.
+			xs (array_like): the fractions.
+		
+		Returns:
+			:obj:`list` of :class:`Line`: Interpolated lines.
+		
+		"""
+		# plain floats, to avoid intermediate Point and Vector instances
+		p0x, p0y = line_start.p
+		p1x, p1y = line_end.p
+		u0x, u0y = line_start.u
+		u1x, u1y = line_end.u
+		norm = hypot(u0x, u0y)
+		u0x /= norm
+		u0y /= norm
+		norm = hypot(u1x, u1y)
+		u1x /= norm
+		u1y /= norm
+		c = u0x * u1x + u0y * u1y
+		cross = u0x * u1y - u0y * u1x
+		# small angle, linear interpolation is accurate enough
+		linear = cross >= 0 and c > 0.9995
+		if not linear:
+			# angle from u0 to u1, ccw
+			theta = acos(max(-1.0, min(1.0, c)))
+			if cross < 0:
+				theta = 2 * pi - theta
+		xs = np.asarray(xs, dtype=float)
+		# (1 - x) * p0 + x * p1 gives exactly p1 for x = 1
+		px = (1 - xs) * p0x + xs * p1x
+		py = (1 - xs) * p0y + xs * p1y
+		if linear:
+			ux = (1 - xs) * u0x + xs * u1x
+			uy = (1 - xs) * u0y + xs * u1y
+			norm = np.hypot(ux, uy)
+			ux /= norm
+			uy /= norm
+		else:
+			# rotate u0 by x * theta
+			ct = np.cos(xs * theta)
+			st = np.sin(xs * theta)
+			ux = ct * u0x - st * u0y
+			uy = st * u0x + ct * u0y
+		lines = [Line._take(Point(px_i, py_i), Vector(ux_i, uy_i))
+		         for px_i, py_i, ux_i, uy_i in zip(px.tolist(), py.tolist(),
+		                                           ux.tolist(), uy.tolist())]
+		return lines
 	
 	def point(self, s):
 		"""Return the :class:`.Point` at the position ``p + s * u``."""
@@ -205,7 +300,7 @@ class Line(object):
 		             self.p.y + s * self.u.y)
 	
 	def __repr__(self):
-		return "Line({p}, {u})".format(**vars(self))
+		return "Line({}, {})".format(self.p, self.u)
 	
 	def translate(self, **kwargs):
 		"""Translate the starting point.
@@ -29,16 +29,28 @@ import math
 from operator import itemgetter
 from sys import float_info
 
+import numpy as np
+
 from .line import Line
+from .vector import Vector
 
 
 class Part(object):
-	"""Straight part of a ray."""
+	"""Straight part of a ray.
+	
+	The given `line` is copied, unless `_own` is `True`
+	(for internal use, when nobody else holds a reference to `line`).
+	"""
 	
-	def __init__(self, line=None, s=None, n=None):
+	# many parts per beam, save the per-instance __dict__
+	__slots__ = ('line', 's', 'n')
+	
+	def __init__(self, line=None, s=None, n=None, _own=False):
 		if line is None:
 			#: starting point and direction
 			self.line = Line()
+		elif _own:
+			self.line = line
 		else:
 			self.line = line.copy()
 		#: length
@@ -83,10 +95,10 @@ class Part(object):
 		line = Line.from_config(config['line'])
 		s = config['s']
 		n = config['n']
-		return cls(line, s, n)
+		return cls(line, s, n, _own=True)
 		
 	def __repr__(self):
-		return "Part({line}, s={s}, n={n})".format(**vars(self))
+		return "Part({}, s={}, n={})".format(self.line, self.s, self.n)
 	
 	def translate(self, **kwargs):
 		"""Translate the part as a whole.
@@ -118,8 +130,15 @@ class Ray(object):
 	
 	"""
 	
+	__slots__ = ('source', 'parts', 'tag', '_propagated', '_parts_buffer',
+	             '__weakref__')
+	
 	def __init__(self, line0=None, s0=100, source=None, n=None, tag=None):
 		self.source = source
+		# (key, parts) of the last propagation, see propagate()
+		self._propagated = None
+		# reused by parts_array()
+		self._parts_buffer = np.empty((4, 5))
 		if line0 is None:
 			self.parts = (Part(s=s0, n=n),)
 		else:
@@ -173,8 +192,10 @@ class Ray(object):
 			s (float): length of that part
 			n (float, optional): :term:`optical index` encountered by that part.
 		"""
-		p = self.parts[-1].line.point(self.parts[-1].s)
-		self.parts += (Part(Line(p, u), s, n),)
+		last_part = self.parts[-1]
+		# p is a new point, only u needs to be copied
+		p = last_part.line.point(last_part.s)
+		self.parts += (Part(Line._take(p, u.copy()), s, n, _own=True),)
 		
 	def change_s(self, part_index, new_s):
 		"""Change the length of one of the ray parts.
@@ -186,6 +207,37 @@ class Ray(object):
 		"""
 		self.parts[part_index].s = new_s
 		
+	def parts_array(self):
+		"""Return the parts, as an array.
+		
+		The array is a view of a buffer kept by the ray,
+		overwritten by the next call.
+		The parts are read again on each call
+		(they can be changed in many ways).
+		
+		Returns:
+			ndarray: one ``(px, py, ux, uy, s)`` row per part
+		
+		Examples:
+			>>> from geoptics.elements.vector import Point, Vector
+			>>> from geoptics.elements.line import Line
+			>>> ray = Ray(line0=Line(Point(10, 20), Vector(1, 0)), s0=30)
+			>>> ray.parts_array().tolist()
+			[[10.0, 20.0, 1.0, 0.0, 30.0]]
+		
+		"""
+		parts = self.parts
+		count = len(parts)
+		if count > len(self._parts_buffer):
+			# grow geometrically, to reallocate seldom
+			self._parts_buffer = np.empty((max(count, 2 * len(self._parts_buffer)),
+			                               5))
+		data = self._parts_buffer[:count]
+		data[:] = [(part.line.p.x, part.line.p.y,
+		            part.line.u.x, part.line.u.y, part.s)
+		           for part in parts]
+		return data
+	
 	def draw(self):
 		"""Draw the ray.
 		
@@ -209,7 +261,33 @@ class Ray(object):
 		return {'parts': [part.config for part in self.parts]}
 	
 	def propagate(self, scene):
-		"""Propagate ray across scene."""
+		"""Propagate ray across scene.
+		
+		The result is kept, and reused as long as
+		the starting line and the scene regions are unchanged
+		(see :attr:`.Scene.version`).
+		"""
+		key = self._propagation_key(scene)
+		if self._propagated is not None and self._propagated[0] == key:
+			self.parts = [Part(line, s, n)
+			              for line, s, n in self._propagated[1]]
+			self.draw()
+			return
+		self._propagate(scene)
+		# the first part length has been updated
+		self._propagated = (self._propagation_key(scene),
+		                    tuple((part.line.copy(), part.s, part.n)
+		                          for part in self.parts))
+	
+	def _propagation_key(self, scene):
+		"""Return what the propagation result depends on."""
+		part0 = self.parts[0]
+		line0 = part0.line
+		return (scene, scene.version, scene.background.n,
+		        line0.p.x, line0.p.y, line0.u.x, line0.u.y, part0.s)
+	
+	def _propagate(self, scene):
+		"""Propagate ray across scene, without cache."""
 		
 		# get the first part
 		part0 = self.parts[0]
@@ -219,38 +297,48 @@ class Ray(object):
 		# since if it is tangential to the region,
 		# there would be no intersection anyway
 		current_region = scene.region_at(line=part0.line)
+		# intersections with all regions, specialized for this scene
+		intersections_with = scene.compile_propagator()
 		# set first part refractive index
 		part0.n = current_region.n
 		# start with only this first part
 		self.parts = [part0]
 		# initialize to last refractive index encountered by this ray
 		cont = 20  # set to the maximum number of ray parts
+		# take a margin to avoid roundoff error
+		# and jump across multiple tangent surfaces
+		margin = float_info.epsilon * 1000
+		s_key = itemgetter(1)
 		while cont:
 			smin = None
-			intersections = []
 			last_part_line = self.parts[-1].line
-			
-			for region in scene.regions:
-				intersections.extend(region.intersection(last_part_line, 1))
-			
-			if intersections:
-				# intersection returns (i_point, smin, eN, eT)
-				# sort on the second item (smin), smaller first
-				intersections.sort(key=itemgetter(1))
-				
-				for intersection in intersections:
-					# point just after the next intersection
-					# take a margin to avoid roundoff error
-					# and jump across multiple tangent surfaces
-					margin = float_info.epsilon * 1000
-					s_ahead = intersection.s + margin
-					point_ahead = last_part_line.point(s_ahead)
-					region_ahead = scene.region_at(point_ahead)
-					if region_ahead.n != current_region.n:
-						# found a real diopter
-						region2 = region_ahead
-						(i_point, smin, eN, eT) = intersection
-						break
+			# Look for the nearest real diopter.
+			# Most often, this is the nearest intersection,
+			# the other ones are only needed in case of tangent surfaces.
+			intersections = intersections_with(last_part_line,
+			                                   nearest_only=True)
+			complete = False
+			while intersections:
+				# intersection is (i_point, s, eN, eT)
+				intersection = min(intersections, key=s_key)
+				# point just after the next intersection
+				s_ahead = intersection[1] + margin
+				point_ahead = last_part_line.point(s_ahead)
+				region_ahead = scene.region_at(point_ahead)
+				if region_ahead.n != current_region.n:
+					# found a real diopter
+					region2 = region_ahead
+					(i_point, smin, eN, eT) = intersection
+					break
+				# tangent surface, try the next one
+				if not complete:
+					intersections = intersections_with(last_part_line)
+					complete = True
+				# keep the farther ones only (those at the same s
+				# have the same point ahead, hence are not real either)
+				s_tried = intersection[1]
+				intersections = [other for other in intersections
+				                 if other[1] > s_tried]
 			
 			if smin is not None:
 				n2 = region2.n
@@ -270,24 +358,40 @@ class Ray(object):
 					u1T = u1 * eT
 					# refractive index of the incident medium
 					n1 = self.parts[-1].n
-					# u2N^2
-					u2N2 = (
-					  ((n2 / n1) ** 2 - 1) * u1T ** 2
-					  + (n2 / n1) ** 2 * u1N ** 2
-					)
-					if u2N2 >= 0:
-						# refraction
-						# sqrt() but with the same sign as u1N
-						u2N = math.copysign(math.sqrt(u2N2), u1N)
+					if n2 == n1:
+						# same index (normally filtered above), straight through
+						# (add_part copies u_next)
+						u_next = u1
+						n_next = n2
+						next_region = region2
+					elif abs(u1T) < 1e-14:
+						# normal incidence, no deviation and no TIR
+						# eN being a unit vector, u1N * eN normalized is +/- eN
+						# (add_part copies u_next)
+						u_next = eN if u1N > 0 else -eN
 						n_next = n2
 						next_region = region2
 					else:
-						# total internal reflection
-						u2N = - u1N
-						n_next = n1
-						next_region = current_region
-					u_next = u1T * eT + u2N * eN
-					u_next.normalize()
+						# (n2 / n1)^2
+						ratio = n2 / n1
+						ratio2 = ratio * ratio
+						# u2N^2
+						u2N2 = (ratio2 - 1) * u1T * u1T + ratio2 * u1N * u1N
+						if u2N2 >= 0:
+							# refraction
+							# sqrt() but with the same sign as u1N
+							u2N = math.copysign(math.sqrt(u2N2), u1N)
+							n_next = n2
+							next_region = region2
+						else:
+							# total internal reflection
+							u2N = - u1N
+							n_next = n1
+							next_region = current_region
+						# plain floats, to avoid intermediate vectors
+						u_next = Vector(u1T * eT.x + u2N * eN.x,
+						                u1T * eT.y + u2N * eN.y)
+						u_next.normalize()
 					#print "u_next = "
 					# Note: float("inf") should be replaced with math.float_inf
 					#       when python 3.4 support is dropped.
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2016 ederag <edera@gmx.fr>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GeOptics; see the file LICENSE.txt.  If not, see
+# <http://www.gnu.org/licenses/>.
+
+
+"""Propagate many rays at once.
+
+The rays are stored as a "structure of arrays":
+one :mod:`numpy` array per coordinate (``px``, ``py``, ``ux``, ``uy``),
+and all the live rays are advanced together, one interface at a time.
+
+The algebra is the same as in :meth:`.elements.rays.Ray.propagate`,
+that remains the reference implementation.
+
+There is no GPU backend. The scenes handled here hold at most a few
+hundred rays, and the geometry changes on each mouse move.
+The array transfers would cost more than the computation.
+The structure of arrays layout would map directly to one thread per ray,
+should much larger beams ever be needed.
+"""
+
+
+from sys import float_info
+from typing import NamedTuple
+
+import numpy as np
+
+from geoptics.elements.line import Line
+from geoptics.elements.rays import Part
+from geoptics.elements.vector import Point, Vector
+
+
+#: maximum number of parts per ray, same as in :meth:`.Ray.propagate`
+MAX_PARTS = 20
+
+
+class BatchParts(NamedTuple):
+	"""Parts of many rays, as returned by :func:`propagate_batch`.
+	
+	Each array has the shape ``(MAX_PARTS, N)``,
+	the part ``i`` of ray ``j`` being stored in column ``j``, row ``i``.
+	Only the first ``count[j]`` rows of a column are meaningful.
+	"""
+	
+	#: starting points abscissae
+	px: np.ndarray
+	#: starting points ordinates
+	py: np.ndarray
+	#: direction vectors, x component
+	ux: np.ndarray
+	#: direction vectors, y component
+	uy: np.ndarray
+	#: lengths
+	s: np.ndarray
+	#: :term:`optical index`
+	n: np.ndarray
+	#: number of parts, for each ray
+	count: np.ndarray
+	
+	def ray_parts(self, j):
+		"""Return the parts of ray `j`, as a list of :class:`.Part`."""
+		count = self.count[j]
+		return [Part(Line._take(Point(px, py), Vector(ux, uy)), s, n, _own=True)
+		        for px, py, ux, uy, s, n in zip(self.px[:count, j].tolist(),
+		                                        self.py[:count, j].tolist(),
+		                                        self.ux[:count, j].tolist(),
+		                                        self.uy[:count, j].tolist(),
+		                                        self.s[:count, j].tolist(),
+		                                        self.n[:count, j].tolist())]
+
+
+def n_at_batch(scene, px, py, ux=None, uy=None):
+	"""Return the :term:`optical index` at many points.
+	
+	Vectorized :meth:`.elements.scene.Scene.region_at`,
+	but returning the optical index instead of the region.
+	
+	Args:
+		scene (Scene): the scene holding the regions
+		px, py (ndarray): coordinates of the points
+		ux, uy (ndarray):
+			searching directions, default to the x axis,
+			as in :meth:`.elements.regions.Region.contains`
+	
+	Returns:
+		ndarray: optical index at each point
+	
+	"""
+	if ux is None:
+		ux = np.ones_like(px)
+		uy = np.zeros_like(py)
+	n = np.full(px.shape, scene.background.n, dtype=float)
+	found = np.zeros(px.shape, dtype=bool)
+	for region in scene.regions:
+		s = region.intersect_batch(px, py, ux, uy, sign_of_s=1)[0]
+		# odd number of intersections with the region: point inside it
+		inside = (np.isfinite(s).sum(axis=0) % 2).astype(bool)
+		box = region.bbox()
+		if box is not None:
+			# as in Scene.region_at, points outside the box are outside
+			xmin, ymin, xmax, ymax = box
+			inside &= (xmin <= px) & (px <= xmax) & (ymin <= py) & (py <= ymax)
+		# in case of overlapping regions, the first one found wins
+		inside &= ~found
+		n[inside] = region.n
+		found |= inside
+	return n
+
+
+def _nearest_diopter(scene, px, py, ux, uy, n):
+	"""Find the next real diopter for each ray.
+	
+	Returns:
+		:obj:`tuple` of ndarray:
+			``(s, eNx, eNy, eTx, eTy, n2)``,
+			with ``s`` set to ``inf`` for rays hitting nothing.
+	
+	"""
+	M = px.shape[0]
+	s = np.full(M, np.inf)
+	eNx = np.zeros(M)
+	eNy = np.zeros(M)
+	eTx = np.zeros(M)
+	eTy = np.zeros(M)
+	n2 = n.copy()
+	if not scene.regions:
+		return s, eNx, eNy, eTx, eTy, n2
+	# candidates of all regions, one row per candidate
+	s_all, _, eNx_all, eNy_all, eTx_all, eTy_all = scene.intersect_batch(
+	    px, py, ux, uy)
+	
+	# margin to avoid roundoff error
+	# and jump across multiple tangent surfaces
+	margin = float_info.epsilon * 1000
+	pending = np.arange(M)
+	while pending.size:
+		k = np.argmin(s_all[:, pending], axis=0)
+		s_k = s_all[k, pending]
+		hit = np.isfinite(s_k)
+		pending = pending[hit]
+		k = k[hit]
+		s_k = s_k[hit]
+		if not pending.size:
+			break
+		s_ahead = s_k + margin
+		n_ahead = n_at_batch(scene,
+		                     px[pending] + s_ahead * ux[pending],
+		                     py[pending] + s_ahead * uy[pending])
+		real = n_ahead != n[pending]
+		found = pending[real]
+		k_found = k[real]
+		s[found] = s_k[real]
+		eNx[found] = eNx_all[k_found, found]
+		eNy[found] = eNy_all[k_found, found]
+		eTx[found] = eTx_all[k_found, found]
+		eTy[found] = eTy_all[k_found, found]
+		n2[found] = n_ahead[real]
+		# not a real diopter, try the next intersection
+		pending = pending[~real]
+		s_all[k[~real], pending] = np.inf
+	return s, eNx, eNy, eTx, eTy, n2
+
+
+def propagate_batch(scene, px, py, ux, uy, n0=None, s0=100):
+	"""Propagate many rays across the scene.
+	
+	Args:
+		scene (Scene): the scene holding the regions
+		px, py (array_like): coordinates of the rays starting points
+		ux, uy (array_like): coordinates of the rays direction vectors
+		n0 (array_like, optional):
+			:term:`optical index` at the starting points.
+			By default, it is found from the scene regions.
+		s0 (float or array_like):
+			length of the first parts, kept for rays that do not
+			intersect any region.
+	
+	Returns:
+		BatchParts: the parts of all rays
+	
+	"""
+	px = np.array(px, dtype=float)
+	py = np.array(py, dtype=float)
+	ux = np.array(ux, dtype=float)
+	uy = np.array(uy, dtype=float)
+	N = px.shape[0]
+	if n0 is None:
+		n = n_at_batch(scene, px, py, ux, uy)
+	else:
+		n = np.array(np.broadcast_to(n0, (N,)), dtype=float)
+	
+	shape = (MAX_PARTS, N)
+	parts = BatchParts(px=np.full(shape, np.nan),
+	                   py=np.full(shape, np.nan),
+	                   ux=np.full(shape, np.nan),
+	                   uy=np.full(shape, np.nan),
+	                   s=np.full(shape, np.nan),
+	                   n=np.full(shape, np.nan),
+	                   count=np.ones(N, dtype=int),
+	                   )
+	parts.px[0] = px
+	parts.py[0] = py
+	parts.ux[0] = ux
+	parts.uy[0] = uy
+	parts.s[0] = s0
+	parts.n[0] = n
+	
+	# indices of the rays still propagating
+	alive = np.arange(N)
+	for i in range(MAX_PARTS):
+		if not alive.size:
+			break
+		s, eNx, eNy, eTx, eTy, n2 = _nearest_diopter(
+		    scene, px[alive], py[alive], ux[alive], uy[alive], n[alive])
+		hit = np.isfinite(s)
+		# rays without intersection keep their last part unchanged
+		alive = alive[hit]
+		parts.s[i, alive] = s = s[hit]
+		if i == MAX_PARTS - 1:
+			# do not add a last part going straight through regions
+			break
+		eNx, eNy, eTx, eTy, n2 = (
+		    eNx[hit], eNy[hit], eTx[hit], eTy[hit], n2[hit])
+		u1x = ux[alive]
+		u1y = uy[alive]
+		# u1 components along eN (normal) and eT (tangent to interface)
+		u1N = u1x * eNx + u1y * eNy
+		u1T = u1x * eTx + u1y * eTy
+		n1 = n[alive]
+		ratio = n2 / n1
+		ratio2 = ratio * ratio
+		u2N2 = (ratio2 - 1) * u1T * u1T + ratio2 * u1N * u1N
+		refraction = u2N2 >= 0
+		# refraction: sqrt() but with the same sign as u1N
+		# total internal reflection: u2N = - u1N
+		u2N = np.where(refraction,
+		               np.copysign(np.sqrt(np.abs(u2N2)), u1N),
+		               -u1N)
+		n_next = np.where(refraction, n2, n1)
+		u_next_x = u1T * eTx + u2N * eNx
+		u_next_y = u1T * eTy + u2N * eNy
+		norm = np.hypot(u_next_x, u_next_y)
+		
+		px[alive] += s * u1x
+		py[alive] += s * u1y
+		ux[alive] = u_next_x / norm
+		uy[alive] = u_next_y / norm
+		n[alive] = n_next
+		parts.px[i + 1, alive] = px[alive]
+		parts.py[i + 1, alive] = py[alive]
+		parts.ux[i + 1, alive] = ux[alive]
+		parts.uy[i + 1, alive] = uy[alive]
+		parts.s[i + 1, alive] = np.inf
+		parts.n[i + 1, alive] = n_next
+		parts.count[alive] += 1
+	return parts
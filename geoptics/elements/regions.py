@@ -25,24 +25,75 @@ Currently an all-purpose :class:`.Polycurve` is available.
 """
 
 
+from operator import itemgetter
+from typing import NamedTuple
+
+import numpy as np
+
 from geoptics.elements.line import Line
 from geoptics.elements.vector import Point, Vector
 
+from ._kernels import DTYPE, JIT_ENABLED
+from ._kernels import pnpoly, segments_line_intersect
 from .arc import Arc
+from .bvh import build_bvh, enlarge, translated
 from .segment import Segment
 
 
+#: minimum number of segments for a vectorized segments intersection
+#: (any number when the kernels are compiled)
+VECTORIZE_MIN_SEGMENTS = 1 if JIT_ENABLED else 16
+
+
+class _SegmentArrays(NamedTuple):
+	"""Segments of a region, one array item per segment."""
+	
+	x1: np.ndarray
+	y1: np.ndarray
+	x2: np.ndarray
+	y2: np.ndarray
+	dx: np.ndarray
+	dy: np.ndarray
+	#: True if the segment is closer to the x axis
+	xdom: np.ndarray
+	#: bounds on the coordinate closer to the segment direction
+	low: np.ndarray
+	high: np.ndarray
+	eNx: np.ndarray
+	eNy: np.ndarray
+	eTx: np.ndarray
+	eTy: np.ndarray
+
+
 class Region(object):
 	"""Region of space."""
 	
 	def __init__(self, n=None, scene=None):
-		#: :term:`optical index`
-		self.n = n
 		#: physical scene where the region will be placed
 		self.scene = scene
+		self._n = n
 		if scene:
 			self.scene.add(self)
 	
+	@property
+	def n(self):
+		""":term:`optical index`."""
+		return self._n
+	
+	@n.setter
+	def n(self, n):
+		self._n = n
+		self._changed()
+	
+	def _changed(self):
+		"""Tell the scene that the region has changed.
+		
+		To be called after each modification of the region,
+		so that the scene can invalidate what depends on it.
+		"""
+		if self.scene is not None:
+			self.scene._regions_changed()
+	
 	def contains(self, point=None, u=None, line=None):  # noqa: D400
 		"""Is a given point contained in this region ?
 		
@@ -59,8 +110,7 @@ class Region(object):
 		"""
 		if line is None:
 			line = Line(p=point, u=u)
-		intersections = self.intersection(line, sign_of_s=1)
-		if len(intersections) % 2:
+		if self.count_intersections(line) % 2:
 			# odd number of intersections with the region
 			# point is inside it
 			return True
@@ -76,6 +126,59 @@ class Region(object):
 		Args: same as :meth:`.elements.segment.Segment.intersection`
 		"""
 		return []
+	
+	def intersection_forward(self, other):
+		"""Same as :meth:`intersection` with ``sign_of_s=1``."""
+		return self.intersection(other, 1)
+	
+	def intersection_nearest(self, other):
+		"""Return the nearest intersection with `other` as a half line.
+		
+		Same as :meth:`intersection_forward`, restricted to the intersection
+		with the smallest `s` (the list is empty or holds a single item).
+		Specific region classes may overload it with a faster version.
+		"""
+		result = self.intersection_forward(other)
+		if len(result) > 1:
+			return [min(result, key=itemgetter(1))]
+		return result
+	
+	def count_intersections(self, other):
+		"""Return the number of intersections with `other` as a half line.
+		
+		Same as ``len(self.intersection_forward(other))``,
+		that is all :meth:`contains` needs.
+		Specific region classes may overload it with a faster version.
+		"""
+		return len(self.intersection_forward(other))
+	
+	def bbox(self):
+		"""Return the bounding box ``(xmin, ymin, xmax, ymax)``.
+		
+		By default, return `None` (unknown, the region could be anywhere).
+		This method should be overloaded by specific region classes.
+		"""
+		return None
+	
+	def intersect_batch(self, px, py, ux, uy, sign_of_s=0):
+		"""Return the intersections with many lines at once.
+		
+		Vectorized version of :meth:`intersection`.
+		By default, there is no intersection.
+		This method should be overloaded by specific region classes.
+		
+		Args: same as :meth:`.elements.segment.Segment.intersect_batch`
+		
+		Returns:
+			:obj:`tuple` of ndarray:
+				``(s, eNx, eNy, eTx, eTy)``,
+				each of shape ``(K, len(px))``,
+				`K` being the maximum number of intersections per line.
+				`s` is set to `inf` for missing intersections.
+		
+		"""
+		empty = np.empty((0,) + np.shape(px))
+		return empty, empty, empty, empty, empty
 
 
 class Polycurve(Region):
@@ -92,6 +195,10 @@ class Polycurve(Region):
 	"""
 	
 	def __init__(self, n=None, scene=None, tag=None):
+		# BVH, segments arrays and edges, computed when needed
+		self._bvh = None
+		self._segments = None
+		self._edges = None
 		Region.__init__(self, n=n, scene=scene)
 		
 		self.tag = tag
@@ -103,6 +210,7 @@ class Polycurve(Region):
 		"""
 		self.M = [M_start.copy()]
 		self.curves = []
+		self._changed()
 		
 	def add_line(self, M_next):
 		"""Add a straight section to the region boundary.
@@ -112,6 +220,7 @@ class Polycurve(Region):
 		"""
 		self.curves.append(Segment(self.M[-1], M_next))
 		self.M.append(M_next)
+		self._changed()
 	
 	def add_arc(self, M_next, tangent):
 		"""Add an :class:`~.elements.arc.Arc` curve to the boundary.
@@ -121,10 +230,12 @@ class Polycurve(Region):
 		"""
 		self.curves.append(Arc(self.M[-1], M_next, tangent))
 		self.M.append(M_next)
+		self._changed()
 			
 	def close(self):
 		"""Join the last point to the first point with a segment."""
 		self.curves.append(Segment(self.M[-1], self.M[0]))
+		self._changed()
 	
 	@property
 	def config(self):  # noqa: D401
@@ -155,33 +266,363 @@ class Polycurve(Region):
 		region.start(M_start)
 		region.tag = config.get('tag')
 		region.n = config['n']
-		for curve_config in curves_config:
-			cls = curve_config['Class']
-			if cls == 'Segment':
-				M_next = Point.from_config(curve_config['M2'])
-				region.add_line(M_next)
-			elif cls == 'Arc':
-				M_next = Point.from_config(curve_config['M2'])
-				tangent = Vector.from_config(curve_config['tangent'])
-				region.add_arc(M_next, tangent)
-			else:
-				raise NotImplementedError
+		region._begin_curves()
+		try:
+			for curve_config in curves_config:
+				cls = curve_config['Class']
+				if cls == 'Segment':
+					M_next = Point.from_config(curve_config['M2'])
+					region.add_line(M_next)
+				elif cls == 'Arc':
+					M_next = Point.from_config(curve_config['M2'])
+					tangent = Vector.from_config(curve_config['tangent'])
+					region.add_arc(M_next, tangent)
+				else:
+					raise NotImplementedError
+		finally:
+			region._end_curves()
 		# normally, the stored polycurves are already closed
 		# (the last point is equal to the first one)
 		# no need for a final close()
 		return region
 	
+	def _begin_curves(self):
+		"""Hook called before adding many curves in a row.
+		
+		Does nothing here, backends can defer their updates
+		until :meth:`_end_curves`.
+		"""
+	
+	def _end_curves(self):
+		"""Hook called after the curves announced by :meth:`_begin_curves`."""
+	
+	def _changed(self):
+		self._bvh = None
+		self._segments = None
+		self._edges = None
+		Region._changed(self)
+	
+	def bvh(self):
+		"""Return a :class:`.BVH` over the curves.
+		
+		It is built when first needed, and dropped on each modification.
+		"""
+		if self._bvh is None:
+			self._bvh = build_bvh([enlarge(curve.bbox())
+			                       for curve in self.curves])
+		return self._bvh
+	
+	def bbox(self):
+		"""Return the bounding box of the region, `None` if empty."""
+		bvh = self.bvh()
+		return bvh.box[0] if bvh.box else None
+	
+	def _crossed_curves(self, other, sign_of_s, segments=True):
+		"""Return the curves whose bounding box is crossed by `other`.
+		
+		The segments are skipped if `segments` is `False`.
+		"""
+		if not isinstance(other, Line):
+			# let the curves complain
+			return self.curves
+		curves = self.curves
+		crossed = self.bvh().crossed(other, sign_of_s)
+		if segments:
+			return [curves[k] for k in crossed]
+		return [curves[k] for k in crossed
+		        if not isinstance(curves[k], Segment)]
+	
+	def _polygon_edges(self):
+		"""Return the edges of a polygonal region, for :meth:`contains`.
+		
+		The edges are sorted by increasing lowest ordinate,
+		so that the edges around a given ordinate can be found
+		by binary searches (as in INPOLY).
+		
+		Returns:
+			:obj:`tuple` of ndarray:
+				``(ymin, ymax_running, y1, y2, slope, intercept, vertices_y)``,
+				one item per edge, the edge crossing the horizontal line
+				at ordinate `y` at ``x = slope * y + intercept``.
+				`ymax_running` is the running maximum of the highest
+				ordinates.
+				`vertices_y` holds the sorted ordinates of the vertices.
+				`None` if some curves are not segments.
+		"""
+		if self._edges is None:
+			if not all(isinstance(curve, Segment) for curve in self.curves):
+				self._edges = False
+				return None
+			coords = [(seg.M1.x, seg.M1.y, seg.M2.x, seg.M2.y)
+			          for seg in self.curves]
+			x1, y1, x2, y2 = np.array(coords, dtype=DTYPE).reshape(-1, 4).T
+			with np.errstate(divide='ignore', invalid='ignore'):
+				slope = (x2 - x1) / (y2 - y1)
+				intercept = x1 - y1 * slope
+			ymin = np.minimum(y1, y2)
+			order = np.argsort(ymin, kind='stable')
+			ymax_running = np.maximum.accumulate(np.maximum(y1, y2)[order])
+			self._edges = (ymin[order], ymax_running,
+			               y1[order], y2[order], slope[order], intercept[order],
+			               np.unique(y1))
+		return self._edges or None
+	
+	def contains(self, point=None, u=None, line=None):  # noqa: D400
+		"""Is a given point contained in this region ?
+		
+		For polygons (all curves being segments), and when no searching
+		direction is given, the crossing number is computed directly
+		on the edges (PNPOLY test, along the x axis).
+		Otherwise, or for points on the boundary
+		(where the PNPOLY answer may differ, e.g. for a ray grazing a side),
+		the intersections are counted along the given direction.
+		This matters for instance for a ray starting on a surface,
+		towards the inside.
+		
+		Args: same as :meth:`.Region.contains`
+		"""
+		if (u is None and line is None
+		   and self._polygon_edges() is not None):
+			px, py = point.x, point.y
+			edges = self._edges_around(py)
+			if not self._on_boundary(edges, px, py):
+				if JIT_ENABLED:
+					return pnpoly(*edges, px, py)
+				# parity of the number of crossings
+				return bool(np.bitwise_xor.reduce(
+				                self._crossings_mask(edges, px, py)))
+		return Region.contains(self, point=point, u=u, line=line)
+	
+	def _edges_around(self, py):
+		"""Return the polygon edges that may cross the ordinate `py`.
+		
+		Returns:
+			:obj:`tuple` of ndarray: ``(y1, y2, slope, intercept)``,
+				restricted from :meth:`_polygon_edges`.
+		"""
+		ymin, ymax_running, y1, y2, slope, intercept, _ = self._polygon_edges()
+		# only edges with ymin <= py < ymax can cross
+		stop = np.searchsorted(ymin, py, side='right')
+		start = np.searchsorted(ymax_running[:stop], py, side='right')
+		return (y1[start:stop], y2[start:stop],
+		        slope[start:stop], intercept[start:stop])
+	
+	def _on_boundary(self, edges, px, py):
+		"""Return whether the point is at a vertex ordinate, or on an edge.
+		
+		`edges` are those of :meth:`_edges_around`.
+		"""
+		vertices_y = self._polygon_edges()[-1]
+		k = np.searchsorted(vertices_y, py)
+		if k < len(vertices_y) and vertices_y[k] == py:
+			return True
+		y1, y2, slope, intercept = edges
+		with np.errstate(invalid='ignore'):
+			return bool(np.any(slope * py + intercept == px))
+	
+	def _crossings_mask(self, edges, px, py):
+		"""Return which edges cross the horizontal half line from a point.
+		
+		The half line goes from ``(px, py)`` towards increasing x.
+		`edges` are those of :meth:`_edges_around`.
+		"""
+		y1, y2, slope, intercept = edges
+		with np.errstate(invalid='ignore'):
+			return ((y1 > py) != (y2 > py)) & (px < slope * py + intercept)
+	
+	def _segment_arrays(self):
+		"""Return the segments as a :class:`_SegmentArrays`.
+		
+		Returns `None` if there are less than
+		:data:`VECTORIZE_MIN_SEGMENTS` segments.
+		"""
+		if self._segments is None:
+			segments = [curve for curve in self.curves
+			            if isinstance(curve, Segment)]
+			if len(segments) < VECTORIZE_MIN_SEGMENTS:
+				self._segments = False
+				return None
+			coords = [(seg.M1.x, seg.M1.y, seg.M2.x, seg.M2.y)
+			          for seg in segments]
+			x1, y1, x2, y2 = np.array(coords, dtype=DTYPE).T
+			dx = x2 - x1
+			dy = y2 - y1
+			# same bounds check as Segment.intersection,
+			# on the coordinate closer to the segment direction
+			xdom = np.abs(dx) > np.abs(dy)
+			low = np.where(xdom, np.minimum(x1, x2), np.minimum(y1, y2))
+			high = np.where(xdom, np.maximum(x1, x2), np.maximum(y1, y2))
+			with np.errstate(divide='ignore', invalid='ignore'):
+				inv_norm = 1 / np.hypot(dx, dy)
+			eTx = dx * inv_norm
+			eTy = dy * inv_norm
+			self._segments = _SegmentArrays(x1, y1, x2, y2, dx, dy,
+			                                xdom, low, high,
+			                                eTy, -eTx, eTx, eTy)
+		return self._segments or None
+	
+	def _segments_kernel(self, line, sign_of_s):
+		"""Run the compiled kernel, for :meth:`_segments_intersection`.
+		
+		Returns:
+			:obj:`tuple`: ``(out, count)``,
+				as filled by :func:`._kernels.segments_line_intersect`.
+		"""
+		seg = self._segment_arrays()
+		out = np.empty((len(seg.x1), 7))
+		count = segments_line_intersect(seg.x1, seg.y1, seg.x2, seg.y2,
+		                                line.p.x, line.p.y,
+		                                line.u.x, line.u.y, sign_of_s, out)
+		return out, count
+	
+	def _segments_solve(self, line, sign_of_s):
+		"""Solve `line` against all the segments at once, with numpy.
+		
+		Returns:
+			:obj:`tuple` of ndarray:
+				``(ok, s, Mx, My)``, `ok` telling which segments
+				are intersected, at ``(Mx, My)``, ``line.point(s)``.
+		"""
+		seg = self._segment_arrays()
+		qx, qy = line.p.x, line.p.y
+		vx, vy = line.u.x, line.u.y
+		det = vx * seg.dy - vy * seg.dx
+		with np.errstate(divide='ignore', invalid='ignore'):
+			s = ((seg.x1 - qx) * seg.dy - (seg.y1 - qy) * seg.dx) / det
+		Mx = qx + s * vx
+		My = qy + s * vy
+		coord = np.where(seg.xdom, Mx, My)
+		ok = (det != 0) & (coord >= seg.low) & (coord <= seg.high)
+		if sign_of_s == 0:
+			ok &= s != 0
+		else:
+			ok &= s * sign_of_s > 0
+		return ok, s, Mx, My
+	
+	def _segments_intersection(self, line, sign_of_s):
+		"""Intersections of `line` with all the segments at once.
+		
+		Same result as the :meth:`.Segment.intersection` of each segment.
+		The compiled kernel is used if available, numpy otherwise.
+		"""
+		if JIT_ENABLED:
+			out, count = self._segments_kernel(line, sign_of_s)
+			return [(Point(mx, my), s, Vector(eNx, eNy), Vector(eTx, eTy))
+			        for mx, my, s, eNx, eNy, eTx, eTy in out[:count].tolist()]
+		seg = self._segment_arrays()
+		ok, s, Mx, My = self._segments_solve(line, sign_of_s)
+		k = np.flatnonzero(ok)
+		return [(Point(*M), s_k, Vector(*eN), Vector(*eT))
+		        for M, s_k, eN, eT in zip(
+		            zip(Mx[k].tolist(), My[k].tolist()),
+		            s[k].tolist(),
+		            zip(seg.eNx[k].tolist(), seg.eNy[k].tolist()),
+		            zip(seg.eTx[k].tolist(), seg.eTy[k].tolist()))]
+	
 	def intersection(self, other, sign_of_s=0):
 		"""Return the intersections between the region boundaries and other.
 		
 		Args: same as :meth:`.elements.segment.Segment.intersection`
 		"""
-		result = []
-		for curve in self.curves:
+		if isinstance(other, Line) and self._segment_arrays() is not None:
+			result = self._segments_intersection(other, sign_of_s)
+			curves = self._crossed_curves(other, sign_of_s, segments=False)
+		else:
+			result = []
+			curves = self._crossed_curves(other, sign_of_s)
+		for curve in curves:
 			result.extend(curve.intersection(other, sign_of_s))
 		return result
 	
-	def translate(self, **kwargs):
+	def intersection_forward(self, other):
+		"""Same as :meth:`intersection` with ``sign_of_s=1``."""
+		if isinstance(other, Line) and self._segment_arrays() is not None:
+			result = self._segments_intersection(other, 1)
+			curves = self._crossed_curves(other, 1, segments=False)
+		else:
+			result = []
+			curves = self._crossed_curves(other, 1)
+		for curve in curves:
+			result.extend(curve.intersection_forward(other))
+		return result
+	
+	def intersection_nearest(self, other):
+		"""Return the nearest intersection with `other` as a half line.
+		
+		Same as :meth:`.Region.intersection_nearest`, but the curves
+		are tried front to back, stopping as soon as the next curve
+		bounding box starts beyond the nearest intersection found so far.
+		"""
+		if not isinstance(other, Line):
+			return Region.intersection_nearest(self, other)
+		best = None
+		best_s = float("inf")
+		segments = self._segment_arrays() is not None
+		if segments:
+			if JIT_ENABLED:
+				out, count = self._segments_kernel(other, 1)
+				if count:
+					i = np.argmin(out[:count, 2])
+					mx, my, best_s, eNx, eNy, eTx, eTy = out[i].tolist()
+					best = (Point(mx, my), best_s,
+					        Vector(eNx, eNy), Vector(eTx, eTy))
+			else:
+				ok, s, Mx, My = self._segments_solve(other, 1)
+				if ok.any():
+					i = np.flatnonzero(ok)[np.argmin(s[ok])]
+					seg = self._segment_arrays()
+					best_s = float(s[i])
+					best = (Point(float(Mx[i]), float(My[i])), best_s,
+					        Vector(float(seg.eNx[i]), float(seg.eNy[i])),
+					        Vector(float(seg.eTx[i]), float(seg.eTy[i])))
+		curves = self.curves
+		for s_entry, k in self.bvh().crossed_by_entry(other, 1):
+			if s_entry > best_s:
+				# this curve, and all the next ones, are farther
+				break
+			curve = curves[k]
+			if segments and isinstance(curve, Segment):
+				# already done
+				continue
+			for intersection in curve.intersection_forward(other):
+				if intersection[1] < best_s:
+					best = intersection
+					best_s = intersection[1]
+		return [best] if best is not None else []
+	
+	def count_intersections(self, other):
+		"""Return the number of intersections with `other` as a half line.
+		
+		Same as :meth:`.Region.count_intersections`, but the intersections
+		with the segments are only counted, without building them.
+		"""
+		if isinstance(other, Line) and self._segment_arrays() is not None:
+			if JIT_ENABLED:
+				count = self._segments_kernel(other, 1)[1]
+			else:
+				count = int(np.count_nonzero(self._segments_solve(other, 1)[0]))
+			curves = self._crossed_curves(other, 1, segments=False)
+		else:
+			count = 0
+			curves = self._crossed_curves(other, 1)
+		for curve in curves:
+			count += len(curve.intersection_forward(other))
+		return count
+	
+	def intersect_batch(self, px, py, ux, uy, sign_of_s=0):
+		"""Return the intersections with many lines at once.
+		
+		Args: same as :meth:`.elements.segment.Segment.intersect_batch`
+		
+		Returns: same as :meth:`.Region.intersect_batch`
+		"""
+		if not self.curves:
+			return Region.intersect_batch(self, px, py, ux, uy, sign_of_s)
+		results = [curve.intersect_batch(px, py, ux, uy, sign_of_s)
+		           for curve in self.curves]
+		return tuple(np.concatenate(arrays) for arrays in zip(*results))
+	
+	def translate(self, dv=None, dx=0, dy=0):
 		"""Translate the region as a whole.
 		
 		Same syntax and same side effects as
@@ -193,6 +634,35 @@ class Polycurve(Region):
 		
 		Return `self` for convenience
 		"""
+		if dv is not None:
+			dx, dy = dv.x, dv.y
 		for curve in self.curves:
-			curve.translate(**kwargs)
+			curve.translate(dx=dx, dy=dy)
+		self._translate_arrays(dx, dy)
+		# the arrays are still valid, only the scene needs to know
+		Region._changed(self)
 		return self
+	
+	def _translate_arrays(self, dx, dy):
+		"""Translate the cached BVH, segments arrays and edges.
+		
+		Cheaper than building them again,
+		when the region is dragged around.
+		"""
+		if self._bvh is not None:
+			self._bvh = translated(self._bvh, dx, dy)
+		if self._segments:
+			seg = self._segments
+			shift = np.where(seg.xdom, dx, dy)
+			self._segments = seg._replace(x1=seg.x1 + dx, y1=seg.y1 + dy,
+			                              x2=seg.x2 + dx, y2=seg.y2 + dy,
+			                              low=seg.low + shift,
+			                              high=seg.high + shift)
+		if self._edges:
+			(ymin, ymax_running, y1, y2,
+			 slope, intercept, vertices_y) = self._edges
+			with np.errstate(invalid='ignore'):
+				# x - dx = slope * (y - dy) + intercept
+				intercept = intercept + dx - slope * dy
+			self._edges = (ymin + dy, ymax_running + dy, y1 + dy, y2 + dy,
+			               slope, intercept, vertices_y + dy)
@@ -22,6 +22,9 @@
 
 import logging
 logger = logging.getLogger(__name__)   # noqa: E402
+from operator import itemgetter
+
+import numpy as np
 
 from geoptics.elements import rays
 from geoptics.elements import regions
@@ -29,24 +32,36 @@ from geoptics.elements import sources
 from geoptics.elements.rays import Ray
 from geoptics.elements.regions import Region
 from geoptics.elements.sources import Source
-from geoptics.shared.tools import find_classes
+from geoptics.shared.tools import class_index, find_classes
+
+from .bvh import build_bvh
 
 
 class Scene(object):
 	"""Scene holding all items."""
 	
+	# FIXME: duplicated code with guis.qt.scene
+	#: correspondance between names in dumped data and classes
+	class_map = {'Rays': find_classes(rays),
+	             'Sources': find_classes(sources),
+	             'Regions': find_classes(regions)}
+	# regions and sources classes by name, for _add_iterator
+	_class_index = class_index(class_map)
+	
 	def __init__(self):
-		# FIXME: duplicated code with guis.qt.scene
-		# correspondance between names in dumped data and classes
-		self.class_map = {'Rays': find_classes(rays),
-		                  'Sources': find_classes(sources),
-		                  'Regions': find_classes(regions)}
 		#: background medium (air by default)
 		self.background = regions.Region(n=1.0)
 		#: list of all regions, excluding background
 		self.regions = []
 		#: list of all sources
 		self.sources = []
+		#: incremented each time the regions change
+		self.version = 0
+		# cached compile_propagator() result, and its version
+		self._propagator = None
+		self._propagator_version = None
+		# cached _region_index() result
+		self._region_index_cache = None
 
 	def add(self, other):
 		"""Add an element to the scene.
@@ -69,6 +84,7 @@ class Scene(object):
 				raise ValueError("Region already in scene")
 			else:
 				self.regions.append(other)
+				self._regions_changed()
 		elif isinstance(other, Source):
 			if other in self.sources:
 				raise ValueError("Source already in scene")
@@ -97,10 +113,7 @@ class Scene(object):
 		elif 'Class' in config:
 			item_config = config
 			name = item_config['Class']
-			cls = None
-			for category in ('Regions', 'Sources'):
-				if name in self.class_map[category]:
-					cls = self.class_map[category][name]
+			cls = self._class_index.get(name)
 			if cls is None:
 				logger.error("{} class not found".format(name))
 				raise KeyError()
@@ -158,23 +171,167 @@ class Scene(object):
 			raise TypeError("scene: Rays should be removed only from their Source")
 		elif isinstance(other, Region):
 			self.regions.remove(other)
+			self._regions_changed()
 		elif isinstance(other, Source):
 			self.sources.remove(other)
 		else:
 			raise NotImplementedError("Trying to remove {}".format(type(other)))
 	
+	def _regions_changed(self):
+		"""Bump the version, and drop what depends on the regions."""
+		self.version += 1
+		# do not keep removed regions alive
+		self._propagator = None
+		self._region_index_cache = None
+	
+	def _region_index(self):
+		"""Return a :class:`.BVH` over the regions bounding boxes.
+		
+		Returns:
+			:obj:`tuple`: ``(bvh, bounded, unbounded)``,
+				`bounded` being the indices in :attr:`regions`
+				of the BVH items, and `unbounded` the indices of the regions
+				without bounding box.
+		"""
+		if self._region_index_cache is None:
+			boxes = []
+			bounded = []
+			unbounded = []
+			for i, region in enumerate(self.regions):
+				box = region.bbox()
+				if box is None:
+					unbounded.append(i)
+				else:
+					boxes.append(box)
+					bounded.append(i)
+			self._region_index_cache = build_bvh(boxes), bounded, unbounded
+		return self._region_index_cache
+	
+	def compile_propagator(self):
+		"""Return a function specialized for the current regions.
+		
+		The returned function takes a :class:`~.elements.line.Line`,
+		and returns the list of its intersections with all the regions
+		boundaries, for positive `s` (as used by
+		:meth:`~.elements.rays.Ray.propagate`).
+		With the ``nearest_only=True`` keyword argument, only the
+		nearest intersection is returned (in a list, possibly empty).
+		
+		The region methods are bound once,
+		and the function is cached until the regions change
+		(see :attr:`version`).
+		"""
+		if self._propagator_version != self.version:
+			bvh, bounded, unbounded = self._region_index()
+			regions = self.regions
+			forward = tuple(region.intersection_forward for region in regions)
+			nearest = tuple(region.intersection_nearest for region in regions)
+			
+			def intersections(line, nearest_only=False):
+				intersectors = nearest if nearest_only else forward
+				result = []
+				# regions whose bounding box is crossed by the half line
+				for k in bvh.crossed(line, 1):
+					result.extend(intersectors[bounded[k]](line))
+				for i in unbounded:
+					result.extend(intersectors[i](line))
+				if nearest_only and len(result) > 1:
+					return [min(result, key=itemgetter(1))]
+				return result
+			
+			self._propagator = intersections
+			self._propagator_version = self.version
+		return self._propagator
+	
+	def intersect_batch(self, px, py, ux, uy, sign_of_s=1):
+		"""Intersections of many lines with all the regions boundaries.
+		
+		The candidates of all regions are stacked,
+		one row per candidate, one column per line.
+		
+		Args: same as :meth:`.elements.regions.Region.intersect_batch`
+		
+		Returns:
+			:obj:`tuple` of ndarray:
+				``(s, region_id, eNx, eNy, eTx, eTy)``,
+				`region_id` having the shape ``(K,)``
+				(index in :attr:`regions` of the region of each row),
+				the other arrays the shape ``(K, len(px))``.
+				`s` is set to `inf` for missing intersections.
+		
+		"""
+		results = [region.intersect_batch(px, py, ux, uy, sign_of_s)
+		           for region in self.regions]
+		if not results:
+			results = [self.background.intersect_batch(px, py, ux, uy)]
+		region_id = np.concatenate([np.full(len(result[0]), i, dtype=int)
+		                            for i, result in enumerate(results)])
+		s, eNx, eNy, eTx, eTy = (np.concatenate(arrays)
+		                         for arrays in zip(*results))
+		return s, region_id, eNx, eNy, eTx, eTy
+	
+	def intersect_all_batch(self, px, py, ux, uy):
+		"""Nearest forward intersection of many lines with the regions.
+		
+		Vectorized counterpart of the search in
+		:meth:`~.elements.rays.Ray.propagate`, except that
+		tangent surfaces (same index on both sides) are not skipped.
+		
+		Args:
+			px, py (ndarray): coordinates of the lines reference points
+			ux, uy (ndarray): coordinates of the lines direction vectors
+		
+		Returns:
+			:obj:`tuple` of ndarray:
+				``(s, region_id, eNx, eNy, eTx, eTy)``,
+				each of shape ``(len(px),)``.
+				For lines hitting nothing,
+				`s` is `inf` and `region_id` is ``-1``.
+		
+		"""
+		s_all, region_id, eNx, eNy, eTx, eTy = self.intersect_batch(
+		    px, py, ux, uy)
+		N = np.shape(px)[0]
+		if not len(s_all):
+			return (np.full(N, np.inf), np.full(N, -1, dtype=int),
+			        np.zeros(N), np.zeros(N), np.zeros(N), np.zeros(N))
+		k = np.argmin(s_all, axis=0)
+		columns = np.arange(N)
+		s = s_all[k, columns]
+		hit = np.isfinite(s)
+		return (s, np.where(hit, region_id[k], -1),
+		        eNx[k, columns], eNy[k, columns],
+		        eTx[k, columns], eTy[k, columns])
+	
 	def propagate(self, rays=None):
 		"""Propagate rays from sources, across regions."""
 		if rays is None:
-			# by default propagate all rays
-			rays = [ray for source in self.sources for ray in source.rays]
+			# by default propagate all rays, a whole source at once
+			for source in self.sources:
+				source.propagate_batch(self)
+			return
 		for ray in rays:
 			ray.propagate(self)
 	
+	def _candidate_regions(self, point=None, u=None, line=None):
+		"""Return the regions that might hold the point, in order.
+		
+		Args: same as :meth:`region_at`
+		"""
+		if line is not None:
+			point = line.p
+		bvh, bounded, unbounded = self._region_index()
+		indices = [bounded[k] for k in bvh.containing(point.x, point.y)]
+		if unbounded:
+			indices.extend(unbounded)
+		regions = self.regions
+		return [regions[i] for i in sorted(indices)]
+	
 	def region_at(self, *args, **kwargs):
 		"""Return the region where the given point belongs to.
 		
 		In case of overlapping `self.regions`, return the first one found.
+		Only the regions whose bounding box holds the point are tested.
 		
 		Args: same as meth:`geoptics.elements.regions.Region.contains`
 		
@@ -184,7 +341,7 @@ class Scene(object):
 		
 		"""
 		
-		for region in self.regions:
+		for region in self._candidate_regions(*args, **kwargs):
 			if region.contains(*args, **kwargs):
 				return region
 		
@@ -20,8 +20,13 @@
 """Define a geometric Segment [M1, M2]."""
 
 
-from geoptics.elements.vector import Vector_M1M2
+from math import hypot
 
+import numpy as np
+
+from geoptics.elements.vector import Point, Vector
+
+from ._kernels import line_line_s
 from .line import Line
 
 
@@ -33,9 +38,42 @@ class Segment(object):
 		M2 (Point): second end
 	"""
 	
+	__slots__ = ('M1', 'M2',
+	             '_dx', '_dy', '_inv_len', '_nx', '_ny',
+	             '_x_long', '_lo', '_hi', '_kind')
+	
 	def __init__(self, M1, M2):
 		self.M1 = M1.copy()
 		self.M2 = M2.copy()
+		self._update()
+	
+	def _update(self):
+		"""Cache the quantities used by the intersection methods.
+		
+		To be called each time `M1` or `M2` is changed.
+		"""
+		x1, y1 = self.M1
+		x2, y2 = self.M2
+		self._dx = dx = x2 - x1
+		self._dy = dy = y2 - y1
+		length = hypot(dx, dy)
+		# degenerate segments get a null normal
+		self._inv_len = inv_len = 1.0 / length if length else 0.0
+		self._nx = dy * inv_len
+		self._ny = -dx * inv_len
+		# axis-aligned segments have a cheaper intersection
+		if dx == 0 and dy != 0:
+			self._kind = 'vertical'
+		elif dy == 0 and dx != 0:
+			self._kind = 'horizontal'
+		else:
+			self._kind = 'general'
+		# bounds check on the coordinate closer to the segment direction
+		self._x_long = abs(dx) > abs(dy)
+		if self._x_long:
+			self._lo, self._hi = min(x1, x2), max(x1, x2)
+		else:
+			self._lo, self._hi = min(y1, y2), max(y1, y2)
 	
 	@property
 	def config(self):  # noqa: D401
@@ -54,11 +92,22 @@ class Segment(object):
 			:class:`~.elements.vector.Vector`
 		
 		"""
-		return Vector_M1M2(self.M1, self.M2).normal(normalized=normalized)
+		if normalized:
+			return Vector(self._nx, self._ny)
+		return Vector(self._dy, -self._dx)
 	
 	def middle(self):
 		"""Return the middle of the segment."""
-		return (self.M1 + self.M2) * 0.5
+		M1 = self.M1
+		M2 = self.M2
+		return Point((M1.x + M2.x) * 0.5, (M1.y + M2.y) * 0.5)
+	
+	def bbox(self):
+		"""Return the bounding box ``(xmin, ymin, xmax, ymax)``."""
+		M1 = self.M1
+		M2 = self.M2
+		return (min(M1.x, M2.x), min(M1.y, M2.y),
+		        max(M1.x, M2.x), max(M1.y, M2.y))
 	
 	def intersection(self, other, sign_of_s=0):
 		"""Intersections of the segment with another element.
@@ -70,53 +119,114 @@ class Segment(object):
 				i.e. `s_other` must have the same sign
 				as `sign_of_s` or intersection will be empty
 		Returns:
-			:obj:`list` of :class:`.Intersection`: list of intersections
+			:obj:`list` of :class:`.Intersection`-like tuples:
+				list of intersections
 		"""
 		if isinstance(other, Line):
-			result = Line(self.M1,
-			              Vector_M1M2(self.M1, self.M2)
-			              ).intersection(other, sign_of_s)
-			if not result:
-				# no intersection
-				return []
-			else:
-				# there should be only one intersection
-				# split the sequence unpacking in two chunks for
-				# kdevelop semantic analysis
-				intersection, = result
-				Mi, s, eN, eT = intersection
-				if abs(self.M2.x - self.M1.x) > abs(self.M2.y - self.M1.y):
-					# M1M2 closer to x axis
-					if (self.M2.x > self.M1.x):
-						# M2 to the right of M1
-						if (Mi.x < self.M1.x) or (Mi.x > self.M2.x):
-							# outside
-							return []
-					else:
-						# M2 to the left of M1
-						if (Mi.x < self.M2.x) or (Mi.x > self.M1.x):
-							# outside
-							return []
-				else:
-					# M1M2 closer to y axis
-					if (self.M2.y > self.M1.y):
-						# M2 above M1
-						if (Mi.y < self.M1.y) or (Mi.y > self.M2.y):
-							# outside
-							return []
-					else:
-						# M2 below M1
-						if (Mi.y < self.M2.y) or (Mi.y > self.M1.y):
-							# outside
-							return []
+			return self._line_intersection(other, sign_of_s)
+		else:
+			raise NotImplementedError(
+			   "intersection between Line and {}".format(type(other))
+			)
+	
+	def intersection_forward(self, other):
+		"""Same as :meth:`intersection` with ``sign_of_s=1``, but faster."""
+		if isinstance(other, Line):
+			return self._line_intersection(other, 1)
 		else:
 			raise NotImplementedError(
 			   "intersection between Line and {}".format(type(other))
 			)
-		return result
+	
+	def _line_intersection(self, line, sign_of_s):
+		"""Intersection with a line, from the cached quantities.
+		
+		Same result as the supporting line intersection, filtered on the
+		segment, but the objects are only built for an actual intersection.
+		"""
+		p = line.p
+		u = line.u
+		kind = self._kind
+		if kind == 'vertical':
+			if u.x == 0:
+				# parallel
+				return []
+			mx = self.M1.x
+			s = (mx - p.x) / u.x
+			my = coord = p.y + s * u.y
+		elif kind == 'horizontal':
+			if u.y == 0:
+				# parallel
+				return []
+			my = self.M1.y
+			s = (my - p.y) / u.y
+			mx = coord = p.x + s * u.x
+		else:
+			s, ok = line_line_s(self.M1.x, self.M1.y, self._dx, self._dy,
+			                    p.x, p.y, u.x, u.y)
+			if not ok:
+				return []
+			mx = p.x + s * u.x
+			my = p.y + s * u.y
+			coord = mx if self._x_long else my
+		# s == 0 is always rejected, as in Line.intersection
+		if s == 0 or s * sign_of_s < 0:
+			return []
+		if coord < self._lo or coord > self._hi:
+			# outside
+			return []
+		inv_len = self._inv_len
+		return [(Point(mx, my), s,
+		         Vector(self._nx, self._ny),
+		         Vector(self._dx * inv_len, self._dy * inv_len))]
+	
+	def intersect_batch(self, px, py, ux, uy, sign_of_s=0):
+		"""Intersections of the segment with many lines at once.
+		
+		Vectorized version of :meth:`intersection`.
+		
+		Args:
+			px, py (ndarray): coordinates of the lines reference points
+			ux, uy (ndarray): coordinates of the lines direction vectors
+			sign_of_s (int): same as in :meth:`intersection`
+		
+		Returns:
+			:obj:`tuple` of ndarray:
+				``(s, eNx, eNy, eTx, eTy)``, each of shape ``(1, len(px))``.
+				`s` is set to `inf` for lines not intersecting the segment.
+		
+		"""
+		x1, y1 = self.M1
+		dx = self._dx
+		dy = self._dy
+		if self._inv_len == 0:
+			# degenerate segment, colinear with any line
+			s = np.full((1,) + np.shape(px), np.inf)
+			zeros = np.zeros_like(s)
+			return s, zeros, zeros, zeros, zeros
+		with np.errstate(divide='ignore', invalid='ignore'):
+			s = ((x1 - px) * dy - (y1 - py) * dx) / (ux * dy - uy * dx)
+			if self._x_long:
+				# M1M2 closer to x axis
+				coord = px + s * ux
+			else:
+				# M1M2 closer to y axis
+				coord = py + s * uy
+			inside = (coord >= self._lo) & (coord <= self._hi)
+			if sign_of_s == 0:
+				valid = inside & (s != 0)
+			else:
+				valid = inside & (s * sign_of_s > 0)
+		# colinear lines give infinite or nan s, hence invalid
+		s = np.where(valid, s, np.inf)[np.newaxis]
+		shape = s.shape
+		inv_len = self._inv_len
+		return (s,
+		        np.full(shape, self._nx), np.full(shape, self._ny),
+		        np.full(shape, dx * inv_len), np.full(shape, dy * inv_len))
 	
 	def __repr__(self):
-		return "Segment({M1}, {M2})".format(**vars(self))
+		return "Segment({}, {})".format(self.M1, self.M2)
 	
 	def translate(self, **kwargs):
 		"""Translate the segment as a whole.
@@ -132,4 +242,5 @@ class Segment(object):
 		"""
 		self.M1.translate(**kwargs)
 		self.M2.translate(**kwargs)
+		self._update()
 		return self
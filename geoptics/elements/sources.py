@@ -32,6 +32,9 @@ Currently available sources are:
 """
 
 
+import numpy as np
+
+from geoptics.elements import rays_batch
 from geoptics.elements.line import Line
 
 
@@ -92,6 +95,14 @@ class Source(object):
 		for ray in self.rays:
 			ray.translate(**kwargs)
 		return self
+	
+	def propagate_batch(self, scene):
+		"""Propagate all the source rays.
+		
+		Here one ray at a time, subclasses may do better.
+		"""
+		for ray in self.rays:
+			ray.propagate(scene)
 
 
 class SingleRay(Source):
@@ -172,6 +183,23 @@ class Beam(Source):
 		beam.set()
 		return beam
 	
+	def propagate_batch(self, scene):
+		"""Propagate all the beam rays at once.
+		
+		Uses :func:`.rays_batch.propagate_batch`.
+		"""
+		lines = [ray.parts[0].line for ray in self.rays]
+		parts = rays_batch.propagate_batch(
+		            scene,
+		            [line.p.x for line in lines],
+		            [line.p.y for line in lines],
+		            [line.u.x for line in lines],
+		            [line.u.y for line in lines],
+		            s0=[ray.parts[0].s for ray in self.rays])
+		for j, ray in enumerate(self.rays):
+			ray.parts = parts.ray_parts(j)
+			ray.draw()
+	
 	def set(self, line_start=None, line_end=None, s_start=None, s_end=None,
 	        N_inter=None):
 		"""Set beam parameters.
@@ -209,13 +237,9 @@ class Beam(Source):
 			# do not remove the last one
 			del self.rays[(-1 - N_remove):-1]
 		
-		for i in range(N_total):
-			x = i / (N_total - 1)
-			# FIXME: line_start and line_end are the same for all x;
-			#        a lot of calculations are made several times for nothing
-			#        in Line.interpolate
-			#        => it should be possible to pass a list instead
-			#        or even better, a generator ?
-			new_line_0 = Line.interpolate(line_start, line_end, x)
-			self.rays[i].change_line_0(new_line_0)
-			self.rays[i].change_s(0, (1 - x) * s_start + x * s_end)
+		x = np.linspace(0.0, 1.0, N_total)
+		lines = Line.interpolate_many(line_start, line_end, x)
+		s = (1 - x) * s_start + x * s_end
+		for ray, new_line_0, new_s in zip(self.rays, lines, s.tolist()):
+			ray.change_line_0(new_line_0)
+			ray.change_s(0, new_s)
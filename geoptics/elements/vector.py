@@ -20,7 +20,7 @@
 """Points and vectors in 2D."""
 
 
-from math import atan2, sqrt
+from math import atan2, hypot
 
 
 class Point(object):
@@ -175,7 +175,7 @@ class Vector(object):
 	
 	def norm(self):
 		"""Return the vector norm."""
-		return sqrt(self.x * self.x + self.y * self.y)
+		return hypot(self.x, self.y)
 	
 	def normalize(self):
 		"""Normalize vector (divide it by its norm.
@@ -28,8 +28,8 @@
 import logging
 logger = logging.getLogger(__name__)   # noqa: E402
 import weakref
-from functools import wraps
-from inspect import getmembers, getmodule
+from inspect import Parameter, getmodule, signature
+from types import FunctionType
 
 
 # from https://stackoverflow.com/a/682242/3565696
@@ -48,7 +48,6 @@ def g_counterpart(original_class):
 	# make copy of original __init__, so we can call it without recursion
 	orig_init = original_class.__init__
 	
-	@wraps(orig_init)
 	def __init__(self, *args, element=None, **kws):
 		# Explicitly avoid cyclic dependency
 		# between graphical item and python element.
@@ -64,6 +63,10 @@ def g_counterpart(original_class):
 		"""The corresponding element."""
 		return self._e_wr()
 	
+	# only what introspection needs, functools.wraps would do more
+	__init__.__name__ = orig_init.__name__
+	__init__.__qualname__ = orig_init.__qualname__
+	__init__.__doc__ = orig_init.__doc__
 	original_class.__init__ = __init__
 	original_class.e = e
 	return original_class
@@ -74,6 +77,71 @@ def g_counterpart(original_class):
 # ---------------------------------------------------------------------------
 
 
+#: docstring of the overloading methods
+_OVERLOAD_DOC = """ Same as :py:class:`{e_module}.{qualname}`
+                   
+                   Overloaded to call ``{g_name}.g_{name}(self.g, ...)``
+               """
+
+
+def _forwarder(g_func, module):
+	"""Return a function calling ``g_func(self.g, ...)``.
+	
+	Args:
+		g_func (function): the g_<name> method to be called
+		module (str): name of the module the function will belong to
+	
+	The function has the same parameters as `g_func`,
+	so that the common calls, with positional or keyword arguments,
+	do not build an intermediate ``*args`` tuple and ``**kwargs`` dict.
+	
+	If the signature can not be reproduced (e.g. `g_func` is
+	a sphinx autodoc mock), a generic ``*args, **kwargs`` function is returned.
+	"""
+	
+	def func(self, *args, **kwargs):
+		return g_func(self.g, *args, **kwargs)
+	
+	if not isinstance(g_func, FunctionType):
+		return func
+	# drop the g item "self"
+	parameters = list(signature(g_func).parameters.values())[1:]
+	params = []
+	call_args = []
+	for p in parameters:
+		if p.kind == Parameter.POSITIONAL_OR_KEYWORD:
+			params.append(p.name)
+			call_args.append(p.name)
+		elif p.kind == Parameter.VAR_POSITIONAL:
+			params.append("*" + p.name)
+			call_args.append("*" + p.name)
+		elif p.kind == Parameter.KEYWORD_ONLY:
+			if not any(param.startswith("*") for param in params):
+				params.append("*")
+			params.append(p.name)
+			call_args.append("{0}={0}".format(p.name))
+		elif p.kind == Parameter.VAR_KEYWORD:
+			params.append("**" + p.name)
+			call_args.append("**" + p.name)
+		else:
+			# positional only, not worth the trouble
+			return func
+	if "self" in params or "_g_func" in params:
+		return func
+	src = ("def func(self, {}):\n"
+	       "	return _g_func(self.g, {})".format(", ".join(params),
+	                                             ", ".join(call_args)))
+	# the filename shows in tracebacks
+	code = compile(src, "<g_overload {}>".format(g_func.__qualname__), "exec")
+	namespace = {}
+	exec(code, {'__name__': module, '_g_func': g_func}, namespace)
+	func = namespace['func']
+	# defaults are shared, not copied through a repr
+	func.__defaults__ = g_func.__defaults__
+	func.__kwdefaults__ = g_func.__kwdefaults__
+	return func
+
+
 def _g_overload(cls, names):
 	"""Add overloading methods.
 	
@@ -90,40 +158,42 @@ def _g_overload(cls, names):
 	
 	# look for the corresponding _G class in the same module as cls
 	module = getmodule(cls)
-	# can not use getmembers(module, isclass)
-	# because sphinx autodoc_mock_imports are not classes any longer
-	module_classes = dict(getmembers(module))
 	g_cls_name = "_G{}".format(cls.__name__)
-	try:
-		g_cls = module_classes[g_cls_name]
-	except KeyError:
+	# a direct lookup, no need to walk all the module members
+	# (nor to check isclass, sphinx autodoc_mock_imports are not classes)
+	g_cls = getattr(module, g_cls_name, None)
+	if g_cls is None:
 		raise KeyError("could not find the {} counterpart '{}' in "
 		               "module {} "
-		               "holding {}".format(cls, g_cls_name, module, module_classes))
-	
+		               "holding {}".format(cls, g_cls_name, module,
+		                                   sorted(vars(module))))
+	g_name = g_cls.__name__
 	for name in names:
 		# the g_<name> method of the _G<cls> class
 		g_func = getattr(g_cls, "g_{}".format(name))
 		
-		# store g_func in a keyword default value,
-		# otherwise the last g_func is used
-		# wraps here is not compatible with sphinx autodoc_mock_imports
-		#@wraps(g_func)
-		def func(self, *args, g_func=g_func, **kwargs):
-			return g_func(self.g, *args, **kwargs)
+		# (functools.wraps is not compatible with sphinx autodoc_mock_imports,
+		#  the name and doc are set by hand, as in g_counterpart)
+		func = _forwarder(g_func, cls.__module__)
 		
 		# look for the method (in element) which we are overloading,
 		# to provide a link to its documentation
-		method = dict(getmembers(cls))[name]
+		# (walking the mro, as getmembers would invoke all descriptors)
+		for klass in cls.__mro__:
+			if name in klass.__dict__:
+				method = klass.__dict__[name]
+				break
+		else:
+			raise KeyError("{} has no method {}".format(cls, name))
 		e_module = getmodule(method).__name__
 		qualname = method.__qualname__
 		
-		func.__doc__ = """ Same as :py:class:`{e_module}.{qualname}`
-		                   
-		                   Overloaded to call ``{g_name}.g_{name}(self.g, ...)``
-		               """.format(e_module=e_module, qualname=qualname,
-		                          g_name=g_cls.__name__, name=name)
+		func.__doc__ = _OVERLOAD_DOC.format(e_module=e_module,
+		                                    qualname=qualname,
+		                                    g_name=g_name, name=name)
 		
+		func.__name__ = name
+		func.__qualname__ = "{}.{}".format(cls.__qualname__, name)
 		setattr(cls, name, func)
 		#logger.debug("overloaded {}.{} with {}".format(cls, name, func))
 	
@@ -17,10 +17,16 @@
 # <http://www.gnu.org/licenses/>.
 
 
-"""Various utilities used to debug the :mod:`guis.qt` backend."""
+"""Various utilities used to debug the :mod:`guis.qt` backend.
 
+This module is not imported by the package, only explicitly when debugging.
+Hence its imports are kept at the top, they cost nothing otherwise.
+"""
 
+
+import ctypes
 import gc
+from collections import deque
 
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPen
@@ -29,24 +35,47 @@ from PyQt5.QtWidgets import QGraphicsPathItem, QGraphicsRectItem
 from geoptics.guis.qt.handles import PointHandle
 
 
-# This one is from lejlot,
-# http://stackoverflow.com/a/19066146/3565696
 def get(id_: int):
-	"""Return the object having a given id_."""
-	for obj in gc.get_objects():
-		if id(obj) == id_:
-			return obj
+	"""Return the object having a given id_.
+	
+	In CPython, the id is the object address, hence a direct cast
+	instead of a scan of all the objects tracked by the garbage collector.
+	
+	Warning:
+		The object must still be alive,
+		otherwise the interpreter will probably crash.
+	"""
+	return ctypes.cast(id_, ctypes.py_object).value
 
 
-# This one fails for some object, because the gc.get_referrers()
-# does not always return a list of dicts...
-# need to look at its source
 def referrers(obj):
-	"""Find referrers to an object."""
+	"""Find the keys referring to an object.
+	
+	Only the dicts among the :func:`gc.get_referrers` are considered
+	(e.g. the ``__dict__`` of instances, or module globals),
+	other referrers (lists, frames, ...) are skipped.
+	
+	Yields:
+		the keys holding `obj`, use :func:`next` if the first one is enough.
+	"""
+	
+	for d in gc.get_referrers(obj):
+		if isinstance(d, dict):
+			yield from (key for key, value in d.items() if value is obj)
+
+
+#: cosmetic dashed pens, by color, created on first use
+_pens = {}
+
+
+def _dashed_pen(color):
+	"""Return the shared cosmetic dashed pen of a given color."""
 	
-	# there is only one object => only one dict in the list
-	d = gc.get_referrers(obj)[0]
-	return [key for key, value in d if value is obj]
+	pen = _pens.get(color)
+	if pen is None:
+		pen = _pens[color] = QPen(color, 1.5, Qt.DashLine)
+		pen.setCosmetic(True)  # thickness does not scale
+	return pen
 
 
 def show_shape(item):
@@ -58,9 +87,7 @@ def show_shape(item):
 	# FIXME: translate is not enough when itemIgnoresTranformation
 	path.translate(item.scenePos())
 	sh.setPath(path)
-	pen = QPen(Qt.magenta, 1.5, Qt.DashLine)
-	pen.setCosmetic(True)  # thickness does not scale
-	sh.setPen(pen)
+	sh.setPen(_dashed_pen(Qt.magenta))
 	item.scene().addItem(sh)
 	return sh
 
@@ -75,9 +102,7 @@ def show_bounding_rect(item, local=False):
 	else:
 		rect = item.sceneBoundingRect()
 	br = QGraphicsRectItem(rect)
-	pen = QPen(Qt.lightGray, 1.5, Qt.DashLine)
-	pen.setCosmetic(True)  # thickness does not scale
-	br.setPen(pen)
+	br.setPen(_dashed_pen(Qt.lightGray))
 	item.scene().addItem(br)
 	return br
 
@@ -85,20 +110,19 @@ def show_bounding_rect(item, local=False):
 def show_children(item):
 	"""Show all children of an item."""
 	
-	def show_children_idx(item, indent="", idx=0):
-		children_flat = []
-		for item in item.childItems():
-			print("{}: {}{}".format(idx, indent, item))
-			idx += 1
-			if item in children_flat:
-				raise ValueError("duplicate child")
-			else:
-				children_flat.append(item)
-			(new_children_flat, idx) = show_children_idx(item, indent + "    ",
-			                                             idx)
-			children_flat += new_children_flat
-		return (children_flat, idx)
-	(children_flat, _) = show_children_idx(item)
+	# explicit depth first traversal, children shown after their parent
+	stack = deque((child, "") for child in item.childItems())
+	seen = set()
+	children_flat = []
+	while stack:
+		child, indent = stack.popleft()
+		print("{}: {}{}".format(len(children_flat), indent, child))
+		if id(child) in seen:
+			raise ValueError("duplicate child")
+		seen.add(id(child))
+		children_flat.append(child)
+		stack.extendleft(reversed([(grandchild, indent + "    ")
+		                           for grandchild in child.childItems()]))
 	return children_flat
 
 #ch = show_children(source1.g)
@@ -108,12 +132,14 @@ def check_source_rays_consistency(source):
 	"""Check that the source has no missing or orphan rays in the scene."""
 	
 	# all ray elements should have a their .g in scene
-	g_scene_items = source.scene.g.items()
+	# (sets of ids, for constant time lookups)
+	g_scene_items = {id(item) for item in source.scene.g.items()}
 	for ray in source.rays:
-		assert ray.g in g_scene_items
+		assert id(ray.g) in g_scene_items
 	# all source.g children should have a .e that belongs to the source element
+	rays = {id(ray) for ray in source.rays}
 	for item in source.g.childItems():
 		if not isinstance(item, PointHandle):
 			assert item.e is not None
-			assert item.e in source.rays, ("{} corresponding element "
-			                               "not found".format(item))
+			assert id(item.e) in rays, ("{} corresponding element "
+			                            "not found".format(item))
@@ -37,11 +37,19 @@ Allowing handles without any parent (``parent=None``) is *not* implemented yet.
 	hence no need to add the ``scene=`` keyword.
 	
 	This is not the case for :class:`LineHandle` that are python objects
+
+.. note::
+	
+	Neither handle is a QObject,
+	and their signals are python :class:`.signal.Signal` instances,
+	so the handle methods are plain python callables, not Qt slots.
+	Decorating them with ``@pyqtSlot`` would have no effect.
 """
 
 import weakref
+from math import hypot
 
-from PyQt5.QtCore import QPointF, Qt
+from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPen, QVector2D
 from PyQt5.QtWidgets import (
 	QGraphicsEllipseItem,
@@ -57,6 +65,16 @@ from .signal import Signal
 # -------------------------------------------------------------------------
 
 
+def _no_scene():
+	"""Stand-in for a dead weakref, when the item is not in a scene."""
+	return None
+
+
+def _scene_ref(scene):
+	"""Return a weakref to `scene`, that can be None."""
+	return _no_scene if scene is None else weakref.ref(scene)
+
+
 class PointHandle(QGraphicsEllipseItem):
 	"""Handle to control a "point".
 	
@@ -81,12 +99,20 @@ class PointHandle(QGraphicsEllipseItem):
 		#: where `dx` and `dy` are displacements along *x* and *y*,
 		#: in scene coordinates.
 		self.signal_moved = Signal()
+		# bound once, used on each move
+		self._emit_moved = self.signal_moved.emit
 		
 		#: Signal emitted when an `ItemSelectedChange` occurs.
 		#:
 		#: **slot args:** (:obj:`boolean`)
 		self.signal_selected_change = Signal()
 		
+		# weakref to the Qt scene, spares a self.scene() call on each move;
+		# kept up to date in itemChange, but a parent given to the constructor
+		# is not notified (the python overload is not called yet)
+		# (weak, the scene owns the item, and sip keeps its wrapper alive)
+		self._scene_wr = _scene_ref(self.scene())
+		
 		self.relative = relative
 		self.setFlag(QGraphicsItem.ItemIsMovable, True)
 		self.setFlag(QGraphicsItem.ItemIsSelectable, True)
@@ -110,6 +136,11 @@ class PointHandle(QGraphicsEllipseItem):
 		#: The user is responsible for setting it back to False,
 		#: to honor the scene setting
 		self.ignore_move_restrictions = True
+		# the scene is told when the visibility changes (see itemChange),
+		# but itemChange is not called for a parent given to the constructor
+		scene = self._scene_wr()
+		if scene is not None and not relative and self.isVisible():
+			scene.handle_visibility_changed(self, True)
 		
 	def reset_move(self):
 		"""Store the initial position, for :term:`move restrictions`."""
@@ -118,23 +149,18 @@ class PointHandle(QGraphicsEllipseItem):
 	def setPos(self, *args):
 		"""Overload QGraphicsEllipseItem."""
 		
-		parent_item = self.parentItem()
-		if (
-		    (parent_item is None) or not
-		    (QGraphicsItem.ItemIgnoresTransformations and parent_item.flags())
-		   ):
-		     
-			# no parent, or parent has not the ItemIgnoresTransformations flag
-			# so args are in scene coordinates
+		# the relative flag is not enough to choose,
+		# absolute handles have a parent too (the controlled item)
+		if self.parentItem() is None:
+			# no parent, so args are in scene coordinates
 			# but since the flag ItemIgnoresTransformations is set,
 			# setPos should receive device (i.e. view) coordinates
 			view_pos = self.mapFromScene(*args)
 			QGraphicsEllipseItem.setPos(self, view_pos)
 		else:
-			# parent has the ItemIgnoresTransformations flag
-			# hence, by convention adopted here,
-			# args are already in view coordinates
-			# (relative to the parent of course)
+			# by convention adopted here,
+			# args are already in the parent coordinates
+			# (view coordinates for a parent with ItemIgnoresTransformations)
 			QGraphicsEllipseItem.setPos(self, *args)
 		
 	def itemChange(self, change, value):
@@ -143,38 +169,34 @@ class PointHandle(QGraphicsEllipseItem):
 		# noqa see file:///usr/share/doc/packages/python-qt4-devel/doc/html/qgraphicsitem.html#itemChange
 		# they add && scene() to the condition. To check
 		# the example shows also how to keep the item in the scene area
-		if (change == QGraphicsItem.ItemPositionChange):
+		# called on each mouse move, hence the local variables
+		if change == QGraphicsItem.ItemPositionChange:
+			# the new position, modified in place if needed
 			new_pos = value
-			old_pos = self.pos()
-			if self.position_before_move is None:
+			before = self.position_before_move
+			if before is None:
 				# beginning move => keep the original position
-				self.position_before_move = old_pos
-			# total displacement since the beginning of the move
-			total_dx = new_pos.x() - self.position_before_move.x()
-			total_dy = new_pos.y() - self.position_before_move.y()
-			if (
-				(not self.ignore_move_restrictions)
-				and self.scene().move_restrictions_on
-			   ):
+				before = self.position_before_move = self.pos()
+			scene = self._scene_wr()
+			if not self.ignore_move_restrictions and scene.move_restrictions_on:
+				# total displacement since the beginning of the move
+				total_dx = new_pos.x() - before.x()
+				total_dy = new_pos.y() - before.y()
 				if abs(total_dx) >= abs(total_dy):
 					# move along x only
-					new_pos.setY(self.position_before_move.y())
+					new_pos.setY(before.y())
 				else:
 					# move along y only
-					new_pos.setX(self.position_before_move.x())
-			# displacement for this elementary move
-			current_dx = new_pos.x() - old_pos.x()
-			current_dy = new_pos.y() - old_pos.y()
-			#print "dx = ", current_dx, "dy = ", current_dy
-			# move
+					new_pos.setX(before.x())
 			if self.relative:
-				self.signal_moved.emit(current_dx, current_dy)
-			self.scene().move_id += 1
-			value = old_pos + QPointF(current_dx, current_dy)
+				# displacement for this elementary move
+				# (pos() returns a new QPointF, only fetched when needed)
+				old_pos = self.pos()
+				self._emit_moved(new_pos.x() - old_pos.x(),
+				                 new_pos.y() - old_pos.y())
+			scene.move_id += 1
 		elif change == QGraphicsItem.ItemScenePositionHasChanged:
-			new_pos = value
-			#print "abs: ", new_pos
-			self.signal_moved.emit(new_pos.x(), new_pos.y())
+			self._emit_moved(value.x(), value.y())
 		# don't do that here, ItemSceneChange is not raised for children...
 		#elif change == QGraphicsItem.ItemSceneChange:
 		#	print "scene change"
@@ -185,6 +207,20 @@ class PointHandle(QGraphicsEllipseItem):
 		#	new_scene.signal_reset_move.connect(self.reset_move)
 		elif change == QGraphicsItem.ItemSelectedChange:
 			self.signal_selected_change.emit(value)
+		elif change == QGraphicsItem.ItemVisibleHasChanged:
+			# also raised when the parent is shown or hidden
+			scene = self._scene_wr()
+			if scene is not None and not self.relative:
+				scene.handle_visibility_changed(self, bool(value))
+		elif change == QGraphicsItem.ItemSceneChange:
+			# also raised when the parent is removed from the scene
+			scene = self._scene_wr()
+			if scene is not None and not self.relative:
+				scene.handle_visibility_changed(self, False)
+		elif change == QGraphicsItem.ItemSceneHasChanged:
+			self._scene_wr = _scene_ref(value)
+			if value is not None and not self.relative and self.isVisible():
+				value.handle_visibility_changed(self, True)
 		# forward event
 		return QGraphicsItem.itemChange(self, change, value)
 
@@ -204,6 +240,10 @@ class LineHandle(object):
 			the parent for all items composing this handle
 	"""
 	
+	# (__weakref__ is needed by the Signal connections, to bound methods)
+	__slots__ = ('signal_moved', 'line', '_ux', '_uy',
+	             'h_p0', 'h_u', 'line_item', '__weakref__')
+	
 	def __init__(self, line, parent=None, zvalue=1000, **kwargs):
 		
 		#: signal emitted when either end of the LineHandle has been moved.
@@ -221,8 +261,11 @@ class LineHandle(object):
 				"that is related to this handle,\n"
 				"or file an issue with a sufficiently clear motivation.")
 		
-		# handle for the starting point of the line
-		self._h_p0_wr = weakref.ref(PointHandle(parent=parent))
+		#: handle for the starting point of the line
+		# (plain references, read on each move:
+		#  the Qt items do not refer back to this LineHandle,
+		#  their signals hold weak references, so there is no cycle)
+		self.h_p0 = PointHandle(parent=parent)
 		self.h_p0.setPos(self.line.p.x, self.line.p.y)
 		self.h_p0.ignore_move_restrictions = False
 		# connect to signal_moved only here,
@@ -231,20 +274,9 @@ class LineHandle(object):
 		# update_line() which needs the yet undefined self.line_item
 		self.h_p0.signal_moved.connect(self.p0_moved)
 		
-		# self.h_p0.scene() returns the Qt object (_GScene)
-		view = self.h_p0.scene().active_view
-		if view:
-			u_view_x, u_view_y = view.map_vector_from_scene(self.line.u.x,
-			                                                self.line.u.y)
-		else:
-			# no active view (probably inside a test) => no transformation
-			u_view_x = self.line.u.x
-			u_view_y = self.line.u.y
-		# use QVector2D to have normalize
-		self.u_view = QVector2D(u_view_x, u_view_y)
-		# length of 50 pixels to start with
-		self.u_view.normalize()
-		self.u_view *= 50
+		# vector from p0 to the h_u handle, in view coordinates,
+		# kept as plain floats since it changes on each move of h_u
+		self._ux, self._uy = self._u_view_start()
 		#m = self.scene.active_view.matrix()
 		#print "m11", m.m11(), "m21", m.m21()
 		#print "m12", m.m12(), "m22", m.m22()
@@ -254,46 +286,87 @@ class LineHandle(object):
 		# parent is the starting point handle h_p0,
 		# so that when h_p0 is moved the end point follows
 		# hence no relative move and signal_moved is not emitted by h_u
-		# use weakref since the object has a Qt parent,
-		# to avoid circular references
-		self._h_u_wr = weakref.ref(PointHandle(relative=True, parent=self.h_p0))
+		#: handle for the end of the u vector
+		self.h_u = PointHandle(relative=True, parent=self.h_p0)
 		# relative to the parent
-		self.h_u.setPos(self.u_view.toPointF())
+		self.h_u.setPos(self._ux, self._uy)
 		# connect to signal_moved only here,
 		# otherwise setPos() would emit signal_moved
 		# which would call update_line()
 		# which needs the yet undefined self.line_item
 		self.h_u.signal_moved.connect(self.u_moved)
 		
-		# use weakref since the object has a Qt parent,
-		# to avoid circular references
-		self._line_item_wr = weakref.ref(QGraphicsLineItem(parent=self.h_p0))
+		#: line item, joining the point and the end of the u vector
+		self.line_item = QGraphicsLineItem(parent=self.h_p0)
 		self.line_item.setPen(QPen(Qt.black, 0, Qt.DotLine))
 		
 		self.update_line()
 		
 		self.setZValue(zvalue)
 	
-	@property
-	def h_p0(self):
-		"""Handle for the starting point of the line."""
-		return self._h_p0_wr()
+	def _u_view_start(self):
+		"""Return the initial vector from p0 to the h_u handle.
+		
+		In view coordinates, along the line direction,
+		with a length of 50 pixels.
+		"""
+		# self.h_p0.scene() returns the Qt object (_GScene)
+		view = self.h_p0.scene().active_view
+		if view:
+			u_view_x, u_view_y = view.map_vector_from_scene(self.line.u.x,
+			                                                self.line.u.y)
+		else:
+			# no active view (probably inside a test) => no transformation
+			u_view_x = self.line.u.x
+			u_view_y = self.line.u.y
+		norm = hypot(u_view_x, u_view_y)
+		scale = 50 / norm if norm else 0
+		return u_view_x * scale, u_view_y * scale
 	
-	@property
-	def h_u(self):
-		"""Handle for the end of the u vector."""
-		return self._h_u_wr()
+	def set_line(self, line):
+		"""Move the handle to another line, without emitting `signal_moved`.
+		
+		Cheaper than creating a new handle, e.g. on re-selection.
+		
+		Args:
+			line (~geoptics.elements.line.Line): the line to represent
+		"""
+		p, u = line.p, line.u
+		own = self.line
+		if (p.x, p.y, u.x, u.y) == (own.p.x, own.p.y, own.u.x, own.u.y):
+			return
+		self.line = line.copy()
+		# the handles would emit signal_moved, and call p0_moved or u_moved
+		self.h_p0.signal_moved.disconnect(self.p0_moved)
+		self.h_u.signal_moved.disconnect(self.u_moved)
+		try:
+			# this is not a user move, free of move restrictions
+			ignore = self.h_p0.ignore_move_restrictions
+			self.h_p0.ignore_move_restrictions = True
+			self.h_p0.setPos(p.x, p.y)
+			self.h_p0.ignore_move_restrictions = ignore
+			self._ux, self._uy = self._u_view_start()
+			self.h_u.setPos(self._ux, self._uy)
+		finally:
+			self.h_p0.signal_moved.connect(self.p0_moved)
+			self.h_u.signal_moved.connect(self.u_moved)
+		# the next moves start from here
+		self.reset_move()
+		self.update_line()
 	
 	@property
-	def line_item(self):
-		"""Line item, joining the point and the end of the u vector."""
+	def u_view(self):
+		"""Vector from the point to the end handle, in view coordinates.
 		
-		return self._line_item_wr()
+		Returns:
+			QVector2D: a new vector, changing it has no effect on the handle
+		"""
+		return QVector2D(self._ux, self._uy)
 	
 	def update_line(self):
 		"""Update the line item."""
 		
-		self.line_item.setLine(0, 0, self.u_view.x(), self.u_view.y())
+		self.line_item.setLine(0, 0, self._ux, self._uy)
 		
 	def p0_moved(self, x, y):
 		"""React to change of the point position.
@@ -316,18 +389,17 @@ class LineHandle(object):
 			dy (float): displacements of the vector end, in view coordinates.
 		"""
 		
-		du_view = QPointF(dx, dy)
-		self.u_view += QVector2D(du_view)
+		self._ux += dx
+		self._uy += dy
 		self.update_line()
 		
-		view = self.h_p0.scene().active_view
+		view = self.h_p0._scene_wr().active_view
 		if view:
-			u_scene_x, u_scene_y = view.map_vector_to_scene(self.u_view.x(),
-			                                                self.u_view.y())
+			u_scene_x, u_scene_y = view.map_vector_to_scene(self._ux, self._uy)
 		else:
 			# no active view (probably inside a test) => no transformation
-			u_scene_x = self.u_view.x()
-			u_scene_y = self.u_view.y()
+			u_scene_x = self._ux
+			u_scene_y = self._uy
 		
 		self.line.u.x = u_scene_x
 		self.line.u.y = u_scene_y
@@ -34,6 +34,7 @@ from PyQt5.QtCore import (
 	QPoint,
 	QSettings,
 	QSize,
+	Qt,
 	pyqtSlot,
 	qDebug,
 )
@@ -48,8 +49,6 @@ from PyQt5.QtWidgets import (
 	QToolBar,
 )
 
-import yaml  # for load/save
-
 from .scene import Scene
 from .view import GraphicsView, GraphicsViewFrame
 
@@ -73,6 +72,12 @@ app.setOrganizationName("geoptics")
 app.setOrganizationDomain("geoptics.org")  # FIXME: to be updated
 app.setApplicationName("geoptics")
 
+# merge the pending mouse moves (and tablet events, Qt >= 5.10),
+# before they reach the python handlers
+app.setAttribute(Qt.AA_CompressHighFrequencyEvents)
+if hasattr(Qt, 'AA_CompressTabletEvents'):
+	app.setAttribute(Qt.AA_CompressTabletEvents)
+
 
 # main window
 class Gui(QMainWindow):
@@ -93,6 +98,9 @@ class Gui(QMainWindow):
 		
 		self.current_filename = None
 		
+		# created once, shared by read_settings and write_settings
+		self.settings = QSettings()
+		
 		# main drawing area
 		self.scene = Scene()
 		self.view = GraphicsView()
@@ -198,6 +206,7 @@ class Gui(QMainWindow):
 		if app_created_here:
 			sys.exit(app.exec_())
 	
+	@pyqtSlot()
 	def exit(self):
 		"""Clean exit."""
 		
@@ -210,6 +219,7 @@ class Gui(QMainWindow):
 		QMainWindow.closeEvent(self, event)
 		# we could call a dialog, and on cancel, call event.ignore()
 	
+	@pyqtSlot()
 	def display(self):
 		"""Dump the scene configuration to :obj:`sys.stdout`."""
 		self.dump(stream=sys.stdout)
@@ -226,7 +236,14 @@ class Gui(QMainWindow):
 			# "AttributeError: 'bool' object has no attribute 'write'"
 			stream = sys.stdout
 		config = {'Scene': self.scene.config}
-		yaml.dump(config, stream=stream)
+		# imported on first use, not at startup
+		import yaml
+		# libyaml bindings (much faster) if available
+		# the config holds only plain types, the safe dumper is enough
+		Dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+		# flow style for the innermost collections (e.g. points), more compact
+		yaml.dump(config, stream=stream, Dumper=Dumper,
+		          default_flow_style=None, sort_keys=False)
 	
 	@pyqtSlot()
 	def import_slot(self):
@@ -239,12 +256,21 @@ class Gui(QMainWindow):
 		
 		Previous elements in the scene are left untouched.
 		"""
+		# imported on first use, not at startup
+		import yaml
+		# libyaml bindings (much faster) if available
+		SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 		with open(filename, 'r') as f:
-			config = yaml.safe_load(stream=f)
-			if 'Scene' in config:
-				self.scene.add(config['Scene'])
-			else:
-				self.scene.add(config)
+			# same as yaml.safe_load
+			config = yaml.load(f, Loader=SafeLoader)
+		if 'Scene' in config:
+			config = config['Scene']
+		# draw each ray once, after all elements are added
+		self.scene.g.suspend_drawing()
+		try:
+			self.scene.add(config)
+		finally:
+			self.scene.g.resume_drawing()
 	
 	@pyqtSlot()
 	def open(self):
@@ -319,8 +345,7 @@ class Gui(QMainWindow):
 		Same as ``print(*args)``,
 		but do not block until exit.
 		"""
-		str = "".join(["{}".format(arg) for arg in args])
-		qDebug(str)
+		qDebug("".join(map(str, args)))
 	
 	@pyqtSlot()
 	def save(self):
@@ -372,7 +397,7 @@ class Gui(QMainWindow):
 	def write_settings(self):
 		"""Store application settings."""
 		
-		settings = QSettings()
+		settings = self.settings
 		settings.beginGroup("MainWindow")
 		settings.setValue("size", self.size())
 		settings.setValue("pos", self.pos())
@@ -385,7 +410,7 @@ class Gui(QMainWindow):
 		# remember we use sip.setapi('QVariant', 2)
 		# in gui.qt.__init__.py (more info there)
 		# hence we _must_ give the "type=" keyword arguments to value()
-		settings = QSettings()
+		settings = self.settings
 		settings.beginGroup("MainWindow")
 		self.resize(settings.value("size", QSize(400, 400), type=QSize))
 		self.move(settings.value("pos", QPoint(10, 10), type=QPoint))
@@ -394,6 +419,7 @@ class Gui(QMainWindow):
 			self.restoreState(old_settings)
 		settings.endGroup()
 	
+	@pyqtSlot()
 	def select_all(self):
 		"""Select all items in the scene."""
 		
@@ -22,22 +22,36 @@
 import logging
 logger = logging.getLogger(__name__)   # noqa: E402
 import weakref
-from math import isinf
+from functools import lru_cache
 
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPainterPath, QPainterPathStroker, QPen
-from PyQt5.QtWidgets import (
-	QGraphicsItem,
-	QGraphicsPathItem,
-	QStyle,
-	QStyleOptionGraphicsItem,
-)
+from PyQt5.QtCore import QPointF, Qt
+from PyQt5.QtGui import QPainterPath, QPainterPathStroker, QPen, QPolygonF
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsPathItem
+
+import numpy as np
 
 from geoptics import elements
+from geoptics.elements._kernels import JIT_ENABLED, parts_ends
 
 from .counterpart import GOverload, g_counterpart
 
 
+@lru_cache(maxsize=None)
+def qreal_dtype():
+	"""Return the numpy dtype matching qreal.
+	
+	qreal is double, unless Qt was configured with ``-qreal float``
+	(some embedded platforms).
+	Probed on first use (not at import, the sphinx mocks have no buffer).
+	"""
+	polygon = QPolygonF([QPointF(1.5, 2.5)])
+	buffer = polygon.data()
+	buffer.setsize(8)
+	if np.frombuffer(buffer, dtype=np.float64)[0] == 1.5:
+		return np.dtype(np.float64)
+	return np.dtype(np.float32)
+
+
 # -------------------------------------------------------------------------
 #                             Ray
 # -------------------------------------------------------------------------
@@ -46,6 +60,16 @@ from .counterpart import GOverload, g_counterpart
 class _GRay(QGraphicsPathItem):
 	"""The graphical class corresponding to :class:`.Ray`."""
 	
+	# pens shared by all rays (setPen copies them, implicitly shared)
+	#: pen for normal state
+	pen_normal = QPen(Qt.blue, 1.5, Qt.SolidLine)
+	pen_normal.setCosmetic(True)  # thickness does not scale
+	#: pen for hover state
+	pen_hover = QPen(Qt.gray, 1.5, Qt.SolidLine)
+	pen_hover.setCosmetic(True)  # thickness does not scale
+	# used in shape(), with default settings, shared by all rays
+	_stroker = QPainterPathStroker()
+	
 	# note: @g_counterpart will add a keyword argument, "element"
 	def __init__(self, **kwargs):
 		QGraphicsPathItem.__init__(self, **kwargs)
@@ -57,41 +81,82 @@ class _GRay(QGraphicsPathItem):
 		# This avoid selection problems (ray is always behind handles)
 		self.setFlag(QGraphicsItem.ItemStacksBehindParent, True)
 		
-		# pen for normal state
-		self.pen_normal = QPen(Qt.blue, 1.5, Qt.SolidLine)
-		self.pen_normal.setCosmetic(True)  # thickness does not scale
+		# the pen depends on the hover state, chosen in paint()
 		self.setPen(self.pen_normal)
-		# pen for hover state
-		self.pen_hover = QPen(Qt.gray, 1.5, Qt.SolidLine)
-		self.pen_hover.setCosmetic(True)  # thickness does not scale
-		
-		# will be used in shape()
-		self.stroker = QPainterPathStroker()
+		self._hovered = False
 		
 		self._selected = False
 		
+		# cache of the path, but the last part, see g_draw
+		self._prefix_key = None
+		self._prefix_path = None
+		# cache of shape(), reset when the path changes
+		self._shape = None
+		
 	def g_draw(self):
+		scene = self.scene()
+		if scene is not None and scene.drawing_suspended:
+			# will be drawn by scene.resume_drawing()
+			return
 		self.prepareGeometryChange()
 		# prevent BSPtree corruption (Qt crash)
-		self.e.source.g.prepareGeometryChange()
-		path = QPainterPath()
-		# begin at the beginning
-		p0 = self.e.parts[0].line.p
-		path.moveTo(p0.x, p0.y)
-		# add lines
-		for part in self.e.parts:
-			if isinf(part.s):
-				# something large, but not inf, for Qt
-				# make sure the ray extends more than the whole scene
-				scene_rect = self.scene().sceneRect()
-				s = 2 * max(scene_rect.width(), scene_rect.height())
-			else:
-				s = part.s
-			path.lineTo(part.line.p.x + part.line.u.x * s,
-			            part.line.p.y + part.line.u.y * s)
+		self.e.source.g.prepare_rays_change()
+		# one row per part: px, py, ux, uy, s
+		# (in a buffer reused from one draw to the next)
+		data = self.e.parts_array()
+		s = data[:, 4]
+		inf = np.isinf(s)
+		if inf.any():
+			# something large, but not inf, for Qt
+			# make sure the ray extends more than the whole scene
+			scene_rect = scene.sceneRect()
+			s[inf] = 2 * max(scene_rect.width(), scene_rect.height())
+		# the parts before the last one are often unchanged
+		# (e.g. during the drag of a region beyond the ray penultimate part),
+		# keep their path, keyed by their values (and the beginning)
+		prefix_key = data[0, :2].tobytes() + data[:-1].tobytes()
+		if prefix_key != self._prefix_key:
+			self._prefix_path = self._polyline_path(data[0, :2], data[:-1])
+			self._prefix_key = prefix_key
+		# (implicitly shared copy)
+		path = QPainterPath(self._prefix_path)
+		px, py, ux, uy, s = data[-1].tolist()
+		path.lineTo(px + ux * s, py + uy * s)
 		
 		# update to the new path
 		self.setPath(path)
+		self._shape = None
+		self.e.source.g.rays_changed()
+	
+	@staticmethod
+	def _polyline_path(start, data):
+		"""Return the path from `start`, along the parts given in `data`.
+		
+		Args:
+			start (ndarray): ``(x, y)`` of the path beginning
+			data (ndarray): one ``(px, py, ux, uy, s)`` row per part
+		"""
+		
+		# the polyline is written directly in the QPolygonF buffer,
+		# the beginning followed by the parts ends
+		# (a single QPolygonF, instead of one QPointF or lineTo per point)
+		qreal = qreal_dtype()
+		polygon = QPolygonF(len(data) + 1)
+		buffer = polygon.data()
+		buffer.setsize(2 * qreal.itemsize * (len(data) + 1))
+		xy = np.frombuffer(buffer, dtype=qreal).reshape(-1, 2)
+		xy[0] = start
+		if JIT_ENABLED:
+			# single pass, no temporary arrays
+			parts_ends(data, xy[1:])
+		else:
+			# (the plain python kernel would be slower than numpy)
+			xy[1:, 0] = data[:, 0] + data[:, 2] * data[:, 4]
+			xy[1:, 1] = data[:, 1] + data[:, 3] * data[:, 4]
+		# moveTo the first point, and lineTo the next ones
+		path = QPainterPath()
+		path.addPolygon(polygon)
+		return path
 	
 	def g_add_part(self, u, s, n=None):
 		elements.rays.Ray.add_part(self.e, u, s, n)
@@ -104,14 +169,17 @@ class _GRay(QGraphicsPathItem):
 	def hoverEnterEvent(self, event):
 		"""Overload QGraphicsPathItem method."""
 		
-		self.setPen(self.pen_hover)
+		# no setPen, that would invalidate the cached geometry
+		self._hovered = True
+		self.update()
 		QGraphicsPathItem.hoverEnterEvent(self, event)
 		
 	def hoverLeaveEvent(self, event):
 		"""Overload QGraphicsPathItem method."""
 		
-		self.setPen(self.pen_normal)
-		QGraphicsPathItem.hoverEnterEvent(self, event)
+		self._hovered = False
+		self.update()
+		QGraphicsPathItem.hoverLeaveEvent(self, event)
 		
 	def itemChange(self, change, value):
 		"""Overload QGraphicsPathItem method."""
@@ -129,11 +197,12 @@ class _GRay(QGraphicsPathItem):
 	def paint(self, painter, option, widget=None):
 		"""Overload QGraphicsPathItem method."""
 		
-		new_option = QStyleOptionGraphicsItem(option)
-		# suppress the "selected" state
-		# this avoids the dashed rectangle surrounding the ray when selected
-		new_option.state = QStyle.State_None
-		QGraphicsPathItem.paint(self, painter, new_option, widget)
+		# draw the path directly, instead of calling the base method.
+		# This also suppresses the "selected" state,
+		# hence the dashed rectangle surrounding the ray when selected
+		painter.setPen(self.pen_hover if self._hovered else self.pen_normal)
+		painter.setBrush(self.brush())
+		painter.drawPath(self.path())
 	
 	def shape(self):
 		"""Overload QGraphicsPathItem method."""
@@ -144,7 +213,11 @@ class _GRay(QGraphicsPathItem):
 		# to avoid that, we need to reimplement shape,
 		# with a QPainterPathStroker which
 		# creates a shape that closely fits the line
-		return self.stroker.createStroke(self.path())
+		# called many times per frame (hit tests, BSP tree),
+		# the stroke is computed once per path
+		if self._shape is None:
+			self._shape = self._stroker.createStroke(self.path())
+		return self._shape
 	
 	def setSelected(self, selected):
 		"""Overload QGraphicsPathItem method."""
@@ -196,8 +269,9 @@ class Ray(elements.rays.Ray):
 		
 		# if the deletion comes from the qt side, self.g is None
 		if self.g:
-			self.source.g.prepareGeometryChange()
+			self.source.g.prepare_rays_change()
 			self.g.scene().removeItem(self.g)
+			self.source.g.rays_changed()
 	
 	@property
 	def g(self):
@@ -26,6 +26,7 @@ from math import pi
 
 from PyQt5.QtCore import QPointF, Qt
 from PyQt5.QtGui import (
+	QBrush,
 	QColor,
 	QPainterPath,
 	QPen,
@@ -59,16 +60,18 @@ class _GPolycurve(QGraphicsPathItem):
 		first issue a :meth:`reset_move()`
 	"""
 	
+	# shared by all regions (setPen and setBrush copy them, implicitly shared)
+	_pen = QPen(Qt.black, 1.5, Qt.SolidLine)
+	_pen.setCosmetic(True)  # thickness independent os scale
+	_brush = QBrush(QColor("lightYellow"))
+	#_brush = QBrush(QColor("Magenta").darker(120))
+	
 	# note: @g_counterpart will add a keyword argument, "element"
 	def __init__(self, **kwargs):
 		QGraphicsPathItem.__init__(self, **kwargs)
 		
-		# pen
-		pen = QPen(Qt.black, 1.5, Qt.SolidLine)
-		pen.setCosmetic(True)  # thickness independent os scale
-		self.setPen(pen)
-		self.setBrush(QColor("lightYellow"))
-		#self.setBrush(QColor("Magenta").darker(120))
+		self.setPen(self._pen)
+		self.setBrush(self._brush)
 		
 		# move handling
 		self.setFlag(QGraphicsItem.ItemIsMovable, True)
@@ -76,6 +79,43 @@ class _GPolycurve(QGraphicsPathItem):
 		# needed to handle move event
 		self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
 		self.setAcceptHoverEvents(True)
+		
+		# path being built between begin_batch() and end_batch(),
+		# with the first point of the region (origin of the path)
+		self._pending_path = None
+		self._pending_M0 = None
+	
+	def begin_batch(self):
+		"""Accumulate the next curves, until :meth:`end_batch`.
+		
+		The path is then set once (a single geometry change),
+		instead of once per curve.
+		"""
+		self._pending_path = self.path()
+		self._pending_M0 = self.e.M[0]
+	
+	def end_batch(self):
+		"""Set the path accumulated since :meth:`begin_batch`."""
+		path = self._pending_path
+		self._pending_path = self._pending_M0 = None
+		self.setPath(path)
+	
+	def _path_to_edit(self):
+		"""Return the path to be extended, pending or a copy of the current.
+		
+		Returns:
+			:obj:`tuple`: ``(path, M0)``,
+				`M0` being the first point of the region.
+				Qt paths are relative to that point.
+		"""
+		if self._pending_path is not None:
+			return self._pending_path, self._pending_M0
+		return self.path(), self.e.M[0]
+	
+	def _edited_path(self, path):
+		"""Set the extended path, unless in a batch."""
+		if self._pending_path is None:
+			self.setPath(path)
 	
 	def g_add_arc(self, M_next, tangent):
 		elements.regions.Polycurve.add_arc(self.e, M_next, tangent)
@@ -95,27 +135,23 @@ class _GPolycurve(QGraphicsPathItem):
 		qt_theta1 = -arc.theta1 * 180.0 / pi
 		qt_span = -span * 180.0 / pi
 		
-		path = self.path()
-		# Qt paths are relative to the first point of the region
-		M0 = self.e.M[0]
+		path, M0 = self._path_to_edit()
 		path.arcTo(C.x - M0.x - arc.r, C.y - M0.y - arc.r,
 		           w, h, qt_theta1, qt_span)
-		self.setPath(path)
+		self._edited_path(path)
 	
 	def g_add_line(self, M_next):
 		elements.regions.Polycurve.add_line(self.e, M_next)
 		# we can not do self.setPath( self.path().lineTo(M_next.x, M_next.y) )
-		path = self.path()
-		# Qt paths are relative to the first point of the region
-		M0 = self.e.M[0]
+		path, M0 = self._path_to_edit()
 		path.lineTo(M_next.x - M0.x, M_next.y - M0.y)
-		self.setPath(path)
+		self._edited_path(path)
 	
 	def g_close(self):
 		elements.regions.Polycurve.close(self.e)
-		path = self.path()
+		path = self._path_to_edit()[0]
 		path.closeSubpath()
-		self.setPath(path)
+		self._edited_path(path)
 	
 	def g_start(self, M_start):
 		elements.regions.Polycurve.start(self.e, M_start)
@@ -138,53 +174,67 @@ class _GPolycurve(QGraphicsPathItem):
 		# moveBy is inherited from QGraphicsPathItem
 		self.moveBy(dx, dy)
 	
+	def _on_selected_change(self, value):
+		# reset, since not in a move
+		self.position_before_move = None
+		return value
+	
+	def _on_position_change(self, value):
+		scene = self.scene()
+		new_pos = value
+		old_pos = self.pos()
+		before = self.position_before_move
+		if before is None:
+			# beginning move => keep the original position
+			before = self.position_before_move = old_pos
+		# total displacement since the beginning of the move
+		total_dx = new_pos.x() - before.x()
+		total_dy = new_pos.y() - before.y()
+		if scene.move_restrictions_on:
+			# move along x only, or along y only
+			along_x = abs(total_dx) >= abs(total_dy)
+			new_pos = QPointF(new_pos.x() if along_x else before.x(),
+			                  before.y() if along_x else new_pos.y())
+		# displacement for this elementary move
+		current_dx = new_pos.x() - old_pos.x()
+		current_dy = new_pos.y() - old_pos.y()
+		# move
+		# the Qt item will be translated by Qt, based on "value"
+		# the listener will move the element
+		elements.regions.Polycurve.translate(self.e, dx=current_dx,
+		                                             dy=current_dy)
+		
+		scene.move_id += 1
+		return old_pos + QPointF(current_dx, current_dy)
+	
+	def _on_scene_change(self, value):
+		old_scene = self.scene()
+		new_scene = value
+		if old_scene:
+			old_scene.signal_set_all_selected.disconnect(self.setSelected)
+			old_scene.signal_reset_move.disconnect(self.reset_move)
+		if new_scene:
+			new_scene.signal_set_all_selected.connect(self.setSelected)
+			new_scene.signal_reset_move.connect(self.reset_move)
+		return value
+	
+	# handlers of itemChange, by change
+	# (looked up once per event, instead of an if/elif cascade)
+	_DISPATCH = {
+		QGraphicsItem.ItemSelectedChange: _on_selected_change,
+		QGraphicsItem.ItemPositionChange: _on_position_change,
+		QGraphicsItem.ItemSceneChange: _on_scene_change,
+	}
+	
 	def itemChange(self, change, value):
 		"""Overload QGraphicsPathItem."""
 		
 		# noqa see file:///usr/share/doc/packages/python-qt4-devel/doc/html/qgraphicsitem.html#itemChange
 		# they add && scene() to the condition. To check
 		# the example shows also how to keep the item in the scene area
-		if change == QGraphicsItem.ItemSelectedChange:
-			# reset, since not in a move
-			self.position_before_move = None
-		elif change == QGraphicsItem.ItemPositionChange:
-			#print "pos changed to: ", value
-			new_pos = value
-			old_pos = self.pos()
-			if self.position_before_move is None:
-				# beginning move => keep the original position
-				self.position_before_move = old_pos
-			# total displacement since the beginning of the move
-			total_dx = new_pos.x() - self.position_before_move.x()
-			total_dy = new_pos.y() - self.position_before_move.y()
-			if self.scene().move_restrictions_on:
-				if abs(total_dx) >= abs(total_dy):
-					# move along x only
-					new_pos.setY(self.position_before_move.y())
-				else:
-					# move along y only
-					new_pos.setX(self.position_before_move.x())
-			# displacement for this elementary move
-			current_dx = new_pos.x() - old_pos.x()
-			current_dy = new_pos.y() - old_pos.y()
-			#print "dx = ", current_dx, "dy = ", current_dy, self
-			# move
-			# the Qt item will be translated by Qt, based on "value"
-			# the listener will move the element
-			elements.regions.Polycurve.translate(self.e, dx=current_dx,
-			                                             dy=current_dy)
-			
-			self.scene().move_id += 1
-			value = old_pos + QPointF(current_dx, current_dy)
-		elif change == QGraphicsItem.ItemSceneChange:
-			old_scene = self.scene()
-			new_scene = value
-			if old_scene:
-				old_scene.signal_set_all_selected.disconnect(self.setSelected)
-				old_scene.signal_reset_move.disconnect(self.reset_move)
-			if new_scene:
-				new_scene.signal_set_all_selected.connect(self.setSelected)
-				new_scene.signal_reset_move.connect(self.reset_move)
+		handler = self._DISPATCH.get(change)
+		if handler is not None:
+			value = handler(self, value)
 		# forward event
 		return QGraphicsPathItem.itemChange(self, change, value)
 	
@@ -244,3 +294,11 @@ class Polycurve(elements.regions.Polycurve):
 		# regions should be below rays
 		# the default zvalue is OK
 		self.g.setZValue(zvalue)
+	
+	def _begin_curves(self):
+		"""Overload :class:`.elements.regions.Polycurve`."""
+		self.g.begin_batch()
+	
+	def _end_curves(self):
+		"""Overload :class:`.elements.regions.Polycurve`."""
+		self.g.end_batch()
@@ -22,17 +22,25 @@ import logging
 logger = logging.getLogger(__name__)   # noqa: E402
 import weakref
 
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtWidgets import QGraphicsScene, QUndoStack
+from PyQt5.QtCore import QTimer, Qt, pyqtSignal, pyqtSlot
+from PyQt5.QtWidgets import QGraphicsScene, QGraphicsView, QUndoStack
 
 from geoptics import elements
-from geoptics.shared.tools import find_classes
+from geoptics.shared.tools import class_index, find_classes
 
 from . import rays
 from . import regions
 from . import sources
 from .counterpart import g_counterpart
-from .handles import PointHandle
+
+
+#: number of visible handles from which the views are fully updated,
+#: instead of computing the area exposed by each moving item
+FULL_UPDATE_HANDLES = 16
+
+#: interval (ms) between the handlings of mouse moves, the moves in between
+#: being coalesced (about once per frame)
+MOVE_FLUSH_INTERVAL = 16
 
 
 @g_counterpart
@@ -64,7 +72,20 @@ class _GScene(QGraphicsScene):
 		# incremented for each move
 		self.move_id = 0
 		self._last_checked_move_id = 0
+		# last mouse position, not handled yet, see _flush_move()
+		self._pending_pos = None
+		# last mouse position received
+		self._last_pos = None
+		self._move_timer = QTimer(self)
+		self._move_timer.setSingleShot(True)
+		self._move_timer.setInterval(MOVE_FLUSH_INTERVAL)
+		self._move_timer.timeout.connect(self._flush_move)
 		self.signal_remove_selected_items.connect(self.remove_selected_items)
+		# absolute PointHandles currently visible,
+		# see handle_visibility_changed()
+		self._visible_handles = set()
+		# rays are not drawn while True, see suspend_drawing()
+		self.drawing_suspended = False
 		
 		self.move_restrictions_on = False
 		"""Whether objects moves should be restricted.
@@ -118,6 +139,49 @@ class _GScene(QGraphicsScene):
 		else:
 			QGraphicsScene.addItem(self, item)
 	
+	def suspend_drawing(self):
+		"""Do not draw the rays, until :meth:`resume_drawing`.
+		
+		Useful for bulk changes (e.g. loading a file),
+		each ray being drawn once at the end, instead of after each change.
+		"""
+		self.drawing_suspended = True
+	
+	def resume_drawing(self):
+		"""Draw all the rays, and resume drawing them on changes."""
+		self.drawing_suspended = False
+		for source in self.e.sources:
+			for ray in source.rays:
+				ray.draw()
+	
+	def handle_visibility_changed(self, handle, visible):
+		"""Choose the views update mode, after a handle was shown or hidden.
+		
+		Called by the (absolute) :class:`.PointHandle` instances,
+		when their visibility or their scene change.
+		
+		With many visible handles, redrawing the whole viewport is cheaper
+		than computing the exposed regions of each item.
+		The views default mode is restored when the handles are hidden.
+		"""
+		handles = self._visible_handles
+		full_before = len(handles) >= FULL_UPDATE_HANDLES
+		if visible:
+			handles.add(handle)
+		else:
+			handles.discard(handle)
+		full = len(handles) >= FULL_UPDATE_HANDLES
+		if full == full_before:
+			return
+		for view in self.views():
+			if full:
+				mode = QGraphicsView.FullViewportUpdate
+			else:
+				mode = getattr(view, 'default_viewport_update_mode',
+				               QGraphicsView.MinimalViewportUpdate)
+			if view.viewportUpdateMode() != mode:
+				view.setViewportUpdateMode(mode)
+	
 	def mousePressEvent(self, event):
 		"""Overload QGraphicsScene method."""
 		
@@ -132,14 +196,40 @@ class _GScene(QGraphicsScene):
 		"""Overload QGraphicsScene method."""
 		
 		self.element_moved = False
+		# the final position is handled right away
+		self._move_timer.stop()
+		self._flush_move()
 		QGraphicsScene.mouseReleaseEvent(self, event)  # forward event
 	
 	def mouseMoveEvent(self, event):
-		"""Overload QGraphicsScene method."""
+		"""Overload QGraphicsScene method.
+		
+		The items are moved at once, but the signals
+		(hence the rays propagation) are emitted by :meth:`_flush_move`,
+		at most once per :data:`MOVE_FLUSH_INTERVAL`, for the last position.
+		"""
 		
 		pos = event.scenePos()
-		self.signal_mouse_position_changed.emit(pos.x(), pos.y())
+		xy = (pos.x(), pos.y())
+		if xy == self._last_pos:
+			# replayed position (e.g. around focus or hover changes),
+			# nothing to emit
+			QGraphicsScene.mouseMoveEvent(self, event)
+			return
+		self._last_pos = self._pending_pos = xy
 		QGraphicsScene.mouseMoveEvent(self, event)
+		if not self._move_timer.isActive():
+			self._move_timer.start()
+	
+	@pyqtSlot()
+	def _flush_move(self):
+		"""Emit the signals for the mouse moves since the last call."""
+		
+		if self._pending_pos is None:
+			return
+		x, y = self._pending_pos
+		self._pending_pos = None
+		self.signal_mouse_position_changed.emit(x, y)
 		if self.move_id != self._last_checked_move_id:
 			#logger.debug("move_id = {}".format(self.move_id))
 			self._last_checked_move_id = self.move_id
@@ -178,19 +268,25 @@ class _GScene(QGraphicsScene):
 		# otherwise garbage collection might destroy the Qt item => crash ?
 		elements.scene.Scene.remove(self.e, item.e)
 	
+	@pyqtSlot()
 	def remove_selected_items(self):
 		"""Remove selected items from scene."""
 		
-		for item in self.items():
-			if (
-			   item.isSelected()
-			   # Rays and PointHandles are removed by their parent
-			   and not isinstance(item, (PointHandle, rays._GRay))
-			   ):
+		# Only the regions and sources are candidates,
+		# rays and PointHandles being removed by their parent.
+		# The element lists are much shorter than self.items().
+		# (selectedItems() would miss the sources,
+		#  whose selection is not known by Qt, see _GBeam.setSelected)
+		# copies, since self.remove modifies the lists
+		candidates = self.e.regions + self.e.sources
+		remove = self.remove
+		for element in candidates:
+			item = element.g
+			if item.isSelected():
 				# workaround children remaining visible (Qt 4.8.6)
 				# item.prepareGeometryChange()  # does not work either
 				item.setVisible(False)
-				self.remove(item)
+				remove(item)
 		self.e.propagate()
 		# Nothing of these worked, sometimes children remained visible,
 		# until another object is drawn over:
@@ -202,14 +298,16 @@ class _GScene(QGraphicsScene):
 class Scene(elements.scene.Scene):
 	"""The Scene that should be instanciated by user, in the guis.qt backend."""
 	
+	#: correspondance between names in config data, and classes
+	class_map = {'Rays': find_classes(rays),
+	             'Sources': find_classes(sources),
+	             'Regions': find_classes(regions)}
+	_class_index = class_index(class_map)
+	
 	def __init__(self, **kwargs):
 		elements.scene.Scene.__init__(self)
 		# The scene Qt part has no parent => owned by self (python part)
 		self.g = _GScene(element=self, **kwargs)
-		#: correspondance between names in config data, and classes
-		self.class_map = {'Rays': find_classes(rays),
-		                  'Sources': find_classes(sources),
-		                  'Regions': find_classes(regions)}
 		self.g.signal_element_moved.connect(self.propagate)
 	
 	def add(self, other, tag=None):
@@ -61,7 +61,12 @@ class Signal:
 		# preventing correct iteration over keys
 		# Besides, raising an error for missing subscriber is
 		# good to catch bugs early
-		self.__subscribers = {}
+		# Weak references to the slots, iterated on each emit.
+		# The tuple is replaced (not modified) on connect/disconnect,
+		# hence immune to connections made by a slot.
+		self.__refs = ()
+		# slots descriptions, only used in error messages
+		self.__names = ()
 		
 	def emit(self, *args, **kwargs):
 		"""Emit signal.
@@ -69,13 +74,14 @@ class Signal:
 		This calls all connected slots with the emit arguments.
 		"""
 		
-		for ref in self.__subscribers.keys():
+		# both tuples are taken at once, a slot replacing them is harmless
+		for ref, name in zip(self.__refs, self.__names):
 			subs = ref()
 			if subs is None:
 				raise ReferenceError(
 				     "{} is not available anymore.\n"
 				     "Signals should be disconnected before deletion".format(
-				                                       self.__subscribers[ref])
+				                                                         name)
 				)
 			else:
 				subs(*args, **kwargs)
@@ -87,13 +93,22 @@ class Signal:
 		# otherwise some objects were not deleted with their c++ counterpart
 		# => crash
 		ref = weakref.WeakMethod(func)
-		self.__subscribers[ref] = func.__repr__()
+		if ref in self.__refs:
+			# already connected
+			return
+		self.__refs += (ref,)
+		self.__names += (repr(func),)
 		
 	def disconnect(self, func):
 		"""Remove a slot from this signal."""
 		
+		# WeakMethod instances compare equal
+		# while their method is alive
 		try:
-			self.__subscribers.remove(func)
+			i = self.__refs.index(weakref.WeakMethod(func))
 		except ValueError:
 			logger.warning("function {} not removed from signal {}".format(
 			                                                       func, self))
+		else:
+			self.__refs = self.__refs[:i] + self.__refs[i + 1:]
+			self.__names = self.__names[:i] + self.__names[i + 1:]
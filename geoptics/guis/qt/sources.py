@@ -20,13 +20,14 @@
 """Sources of light rays for the :mod:`.guis.qt` backend."""
 
 
+from PyQt5.QtCore import QRectF
 from PyQt5.QtGui import QPainterPath
 from PyQt5.QtWidgets import QGraphicsItem
 
 from geoptics import elements
 
 from .counterpart import g_counterpart
-from .handles import LineHandle
+from .handles import LineHandle, PointHandle
 
 
 # note: making it a QGraphicsItemGroup would always move the whole thing
@@ -52,8 +53,13 @@ class _GSource(QGraphicsItem):
 		
 		self._selected = False
 		
-		self.setZValue(zvalue)
+		# caches of shape() and boundingRect(),
+		# reset by prepare_rays_change() and rays_changed()
+		self._shape = None
+		self._bounding_rect = None
 		
+		self.setZValue(zvalue)
+	
 	def itemChange(self, change, value):
 		"""Overload QGraphicsItem method."""
 		
@@ -72,7 +78,15 @@ class _GSource(QGraphicsItem):
 	def boundingRect(self):
 		"""Overload QGraphicsItem method."""
 		
-		return self.childrenBoundingRect()
+		# only the rays, walked only when they changed
+		# (the handles children would not reset the cache)
+		if self._bounding_rect is None:
+			rect = QRectF()
+			for child in self.childItems():
+				if not isinstance(child, PointHandle):
+					rect |= child.mapRectToParent(child.boundingRect())
+			self._bounding_rect = rect
+		return self._bounding_rect
 	
 	def shape(self):
 		"""Overload QGraphicsItem method."""
@@ -80,10 +94,30 @@ class _GSource(QGraphicsItem):
 		# otherwise the shape is the children boundingRect !
 		# and since itemAt uses shape,
 		# the item was found, instead of the background
-		path = QPainterPath()
-		for ray in self.e.rays:
-			path.addPath(ray.g.shape())
-		return path
+		if self._shape is None:
+			path = QPainterPath()
+			for ray in self.e.rays:
+				path.addPath(ray.g.shape())
+			self._shape = path
+		return self._shape
+	
+	def prepare_rays_change(self):
+		"""Prepare for a change of the rays geometry.
+		
+		To be called before a ray is redrawn or removed,
+		and followed by :meth:`rays_changed`.
+		"""
+		self.prepareGeometryChange()
+		self.rays_changed()
+	
+	def rays_changed(self):
+		"""Reset the caches, after a change of the rays geometry.
+		
+		They might have been filled with the former geometry,
+		since :meth:`prepare_rays_change`.
+		"""
+		self._shape = None
+		self._bounding_rect = None
 
 
 # -------------------------------------------------------------------------
@@ -117,10 +151,13 @@ class _GSingleRay(_GSource):
 		# deselected the ray and vice-versa
 		# (multiple selection seems impossible without holding ctrl)
 		if selected:
+			l0 = self.e.rays[0].parts[0].line
 			if self.line_handle is None:
-				l0 = self.e.rays[0].parts[0].line
 				self.line_handle = LineHandle(l0, parent=self)
 				self.line_handle.signal_moved.connect(self.change_line_0)
+			else:
+				# kept since the first selection, follow the ray
+				self.line_handle.set_line(l0)
 			self.line_handle.setVisible(True)
 			self.line_handle.h_p0.setSelected(True)
 		else:
@@ -165,6 +202,10 @@ class _GBeam(_GSource):
 		element (class:`.Beam`): the corresponding element.
 	"""
 	
+	# for each line handle, index of the ray, and name of the slot
+	_HANDLE_SPEC = {'start': (0, 'change_line_start'),
+	                'end': (-1, 'change_line_end')}
+	
 	def __init__(self, element=None, zvalue=100, **kwargs):
 		_GSource.__init__(self, element=element, zvalue=zvalue, **kwargs)
 		self.line_handles = {'start': None, 'end': None}
@@ -187,24 +228,21 @@ class _GBeam(_GSource):
 		# otherwise the selection of pointHandle
 		# deselected the ray and vice-versa
 		# (multiple selection seems impossible without holding ctrl)
+		handles = self.line_handles
 		if selected:
-			for name, handle in self.line_handles.items():
+			for name, (idx, slot_name) in self._HANDLE_SPEC.items():
+				handle = handles[name]
+				line0 = self.e.rays[idx].parts[0].line
 				if handle:
+					# kept since the first selection, follow the ray
+					handle.set_line(line0)
 					handle.setVisible(True)
 				else:
-					if name == 'start':
-						idx = 0
-						change_line = self.change_line_start
-					elif name == 'end':
-						idx = -1
-						change_line = self.change_line_end
-					line0 = self.e.rays[idx].parts[0].line
-					new_handle = LineHandle(line0, parent=self)
-					new_handle.signal_moved.connect(change_line)
-					self.line_handles[name] = new_handle
-				self.line_handles[name].h_p0.setSelected(True)
+					handle = handles[name] = LineHandle(line0, parent=self)
+					handle.signal_moved.connect(getattr(self, slot_name))
+				handle.h_p0.setSelected(True)
 		else:
-			for name, handle in self.line_handles.items():
+			for handle in handles.values():
 				if handle:
 					handle.setVisible(False)
 					handle.h_p0.setSelected(False)
@@ -23,6 +23,7 @@ logger = logging.getLogger(__name__)   # noqa: E402
 
 from PyQt5.QtCore import (
 	QRectF,
+	QTimer,
 	Qt,
 	pyqtSlot
 )
@@ -40,6 +41,11 @@ from PyQt5.QtWidgets import (
 )
 
 
+#: interval (ms) between the translations of the view while panning,
+#: the mouse moves in between being accumulated (about once per frame)
+PAN_FLUSH_INTERVAL = 16
+
+
 # --------------- GraphicsView Frame (holds view, position indicator, ...)
 
 
@@ -83,6 +89,12 @@ class GraphicsViewFrame(QFrame):
 class GraphicsView(QGraphicsView):
 	"""Scene holder."""
 	
+	#: viewport update mode, unless many handles are visible
+	#: (see :meth:`.qt.scene._GScene.handle_visibility_changed`)
+	# (smart: a few exposed regions,
+	#  or their bounding rect if they are many)
+	default_viewport_update_mode = QGraphicsView.SmartViewportUpdate
+	
 	def __init__(self, **kwargs):
 		QGraphicsView.__init__(self, **kwargs)
 		self.setRenderHints(QPainter.Antialiasing)
@@ -92,7 +104,11 @@ class GraphicsView(QGraphicsView):
 		# with y up oriented
 		self.setTransform(QTransform.fromScale(1.0, -1.0))
 		# viewport control (part of the scene displayed)
-		self.setViewportUpdateMode(QGraphicsView.BoundingRectViewportUpdate)
+		self.setViewportUpdateMode(self.default_viewport_update_mode)
+		# all the items set their pen and brush before painting
+		self.setOptimizationFlag(QGraphicsView.DontSavePainterState, True)
+		# (DontAdjustForAntialiasing is not set: the view is antialiased,
+		#  and the moving items would leave traces)
 		self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
 		self.setResizeAnchor(QGraphicsView.AnchorUnderMouse)
 		# seems that the translate stuff is a bit buggy in Qt
@@ -106,33 +122,58 @@ class GraphicsView(QGraphicsView):
 		self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
 		self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
 		
-	def map_vector_from_scene(self, u_scene_x, u_scene_y):
-		"""Map a vector given in scene coords to view coords."""
+		# panning translation not applied yet, see _apply_pan()
+		self._pending_pan_dx = 0
+		self._pending_pan_dy = 0
+		self._pan_timer = QTimer(self)
+		self._pan_timer.setSingleShot(True)
+		self._pan_timer.setInterval(PAN_FLUSH_INTERVAL)
+		self._pan_timer.timeout.connect(self._apply_pan)
 		
-		# we can not use transform.inverted() because the translations
-		# dx, dy are not relevant for vectors
+	def setTransform(self, matrix, combine=False):
+		"""Overload QGraphicsView method, to keep the scaling factors."""
+		QGraphicsView.setTransform(self, matrix, combine)
+		self._update_scaling()
+	
+	def scale(self, sx, sy):
+		"""Overload QGraphicsView method, to keep the scaling factors."""
+		QGraphicsView.scale(self, sx, sy)
+		self._update_scaling()
+	
+	def resetTransform(self):
+		"""Overload QGraphicsView method, to keep the scaling factors."""
+		QGraphicsView.resetTransform(self)
+		self._update_scaling()
+	
+	def _update_scaling(self):
+		"""Store the scaling factors of the transform, and their inverses.
+		
+		Used by the vector mappings,
+		instead of fetching the transform on each call.
+		(translate() does not change them)
+		"""
 		t = self.transform()
 		# we should not have any shear or rotation
 		assert not t.isRotating() and t.m13() == 0 and t.m23() == 0
 		# scaling factors
-		sx = t.m11()
-		sy = t.m22()
-		return u_scene_x * sx, u_scene_y * sy
+		self._sx = sx = t.m11()
+		self._sy = sy = t.m22()
+		# for such a simple translation/scale transform,
+		# direct inversion is faster than transform.inverted()
+		self._inv_sx = 1.0 / sx
+		self._inv_sy = 1.0 / sy
 		
-	def map_vector_to_scene(self, u_view_x, u_view_y):
-		"""Map a vector given in view coords to scene coords."""
+	def map_vector_from_scene(self, u_scene_x, u_scene_y):
+		"""Map a vector given in scene coords to view coords."""
 		
 		# we can not use transform.inverted() because the translations
 		# dx, dy are not relevant for vectors
-		# besides, for such a simple translation/scale transform,
-		# direct inversion should be faster
-		t = self.transform()
-		# we should not have any shear or rotation
-		assert not t.isRotating() and t.m13() == 0 and t.m23() == 0
-		# scaling factors
-		sx = t.m11()
-		sy = t.m22()
-		return u_view_x / sx, u_view_y / sy
+		return u_scene_x * self._sx, u_scene_y * self._sy
+	
+	def map_vector_to_scene(self, u_view_x, u_view_y):
+		"""Map a vector given in view coords to scene coords."""
+		
+		return u_view_x * self._inv_sx, u_view_y * self._inv_sy
 		
 	def enterEvent(self, event):
 		"""Overload QGraphicsView method."""
@@ -173,10 +214,13 @@ class GraphicsView(QGraphicsView):
 	def mouseMoveEvent(self, event):
 		"""Overload QGraphicsView method."""
 		if event.buttons() == Qt.MiddleButton:
-			# panning
+			# panning, the view is translated by _apply_pan()
 			delta = event.pos() - self._previous_position
-			self.translate(delta.x(), delta.y())
+			self._pending_pan_dx += delta.x()
+			self._pending_pan_dy += delta.y()
 			self._previous_position = event.pos()
+			if not self._pan_timer.isActive():
+				self._pan_timer.start()
 		# forwarding
 		QGraphicsView.mouseMoveEvent(self, event)
 		
@@ -184,11 +228,22 @@ class GraphicsView(QGraphicsView):
 		"""Overload QGraphicsView method."""
 		if event.button() == Qt.MiddleButton:
 			# end of panning
+			self._pan_timer.stop()
+			self._apply_pan()
 			self.setTransformationAnchor(self._previous_transformation_anchor)
 			self.setInteractive(self._previous_interactive_state)
 		# forwarding
 		QGraphicsView.mouseReleaseEvent(self, event)
 	
+	@pyqtSlot()
+	def _apply_pan(self):
+		"""Translate the view by the panning moves accumulated so far."""
+		dx = self._pending_pan_dx
+		dy = self._pending_pan_dy
+		if dx or dy:
+			self._pending_pan_dx = self._pending_pan_dy = 0
+			self.translate(dx, dy)
+	
 	def wheelEvent(self, event):
 		"""Ctrl+mouse wheel zoom, otherwise pan."""
 		if event.modifiers() == Qt.ControlModifier:
@@ -26,3 +26,26 @@ def find_classes(module):
 	# [('Beam', <class 'geoptics.guis.qt.sources.Beam'>), ...]
 	lst = inspect.getmembers(module, predicate)
 	return {name: cls for (name, cls) in lst}
+
+
+def class_index(class_map, categories=('Regions', 'Sources')):
+	"""Flatten a class map, for lookups by name only.
+	
+	Args:
+		class_map (dict): {category_str: {name_str: cls}} dictionnary
+		categories (tuple): the categories to include
+	
+	Returns:
+		dict: {name_str: cls} dictionnary
+	
+	Raises:
+		ValueError: if the same name is found in several categories
+	
+	"""
+	index = {}
+	for category in categories:
+		for name, cls in class_map[category].items():
+			if name in index:
+				raise ValueError("{} found in several categories".format(name))
+			index[name] = cls
+	return index
@@ -8,7 +8,6 @@ tg = Vector(10, 10)
 a = Arc(m1, m2, tg)
 c = a.center()
 print(c)
-print(a.radius())
 
 print(a.C)
 print(a.r)
@@ -16,6 +16,8 @@
 # along with GeOptics; see the file LICENSE.txt.  If not, see
 # <http://www.gnu.org/licenses/>.
 
+from math import cos, radians, sin
+
 import pytest
 
 from geoptics.elements.arc import Arc
@@ -68,3 +70,32 @@ def test_orientations():
 	line = Line(Point(30, 20), Vector(10, -30))
 	intersections = arc.intersection(line, sign_of_s=1)
 	assert len(intersections) == 1
+
+
+@pytest.mark.parametrize("tangent, inside, outside", [
+    # minor arc, ccw from 0 to 90 degrees
+    (Vector(0, 1), [10, 45, 80], [100, 180, -45, -100]),
+    # major arc, cw from 0 to 90 degrees (through 180)
+    (Vector(0, -1), [100, 180, -45, -100], [10, 45, 80]),
+])
+def test_contains(tangent, inside, outside):
+	arc = Arc(Point(10, 0), Point(0, 10), tangent)
+	for angles, expected in ((inside, True), (outside, False)):
+		for angle in angles:
+			M = Point(10 * cos(radians(angle)), 10 * sin(radians(angle)))
+			assert (M in arc) is expected
+
+
+def test_copy(arc):
+	arc_copy = arc.copy()
+	assert arc_copy.config == arc.config
+	assert arc_copy.C == arc.C
+	arc_copy.translate(dx=10)
+	assert arc_copy.M1 != arc.M1
+	assert arc_copy.C != arc.C
+
+
+def test_bbox():
+	# half circle, from the top to the bottom, through the left
+	arc = Arc(Point(0, 10), Point(0, -10), Vector(-1, 0))
+	assert arc.bbox() == pytest.approx((-10, -10, 0, 10))
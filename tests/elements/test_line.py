@@ -16,6 +16,8 @@
 # along with GeOptics; see the file LICENSE.txt.  If not, see
 # <http://www.gnu.org/licenses/>.
 
+from math import cos, radians, sin
+
 import pytest
 
 from geoptics.elements.line import Line
@@ -34,3 +36,51 @@ def test_config(line):
 	line_config = line.config
 	assert 'p' in line_config
 	assert 'u' in line_config
+
+
+@pytest.mark.parametrize("sign_of_s", [-1, 0, 1])
+def test_intersection_sign_of_s(line, sign_of_s):
+	# crossing line at s = 1 (forward) and at s = -1 (backward)
+	forward = Line(Point(10, 80), Vector(30, 0))
+	backward = Line(Point(70, 80), Vector(30, 0))
+	hits_forward = line.intersection(forward, sign_of_s)
+	hits_backward = line.intersection(backward, sign_of_s)
+	assert len(hits_forward) == (sign_of_s >= 0)
+	assert len(hits_backward) == (sign_of_s <= 0)
+	if sign_of_s == 1:
+		assert line.intersection_forward(forward)[0][1] == 1
+	elif sign_of_s == 0:
+		assert line.intersection_bidir(backward)[0][1] == -1
+
+
+@pytest.mark.parametrize("angle_start, angle_end", [
+    (0, 0), (10, 10.01), (10, 80), (80, 10), (-170, 170), (0, 180),
+])
+@pytest.mark.parametrize("x", [0, 0.3, 1])
+def test_interpolate(angle_start, angle_end, x):
+	line_start = Line(Point(0, 0),
+	                  Vector(2 * cos(radians(angle_start)),
+	                         2 * sin(radians(angle_start))))
+	line_end = Line(Point(10, 20),
+	                Vector(cos(radians(angle_end)), sin(radians(angle_end))))
+	if angle_end < angle_start:
+		# going ccw from start to end
+		angle_end += 360
+	angle = radians((1 - x) * angle_start + x * angle_end)
+	line = Line.interpolate(line_start, line_end, x)
+	assert (line.p.x, line.p.y) == pytest.approx((10 * x, 20 * x))
+	assert (line.u.x, line.u.y) == pytest.approx((cos(angle), sin(angle)),
+	                                             abs=1e-9)
+
+
+def test_interpolate_many():
+	line_start = Line(Point(0, 0), Vector(1, 0))
+	line_end = Line(Point(10, 20), Vector(0, 3))
+	xs = [i / 6 for i in range(7)]
+	lines = Line.interpolate_many(line_start, line_end, xs)
+	for x, line in zip(xs, lines):
+		expected = Line.interpolate(line_start, line_end, x)
+		assert (line.p.x, line.p.y, line.u.x, line.u.y) == (
+		        expected.p.x, expected.p.y, expected.u.x, expected.u.y)
+	# the end point is reproduced exactly
+	assert (lines[-1].p.x, lines[-1].p.y) == (10, 20)
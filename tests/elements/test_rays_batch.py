@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 ederag <edera@gmx.fr>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GeOptics; see the file LICENSE.txt.  If not, see
+# <http://www.gnu.org/licenses/>.
+
+
+from math import cos, pi, sin
+
+import numpy as np
+
+from geoptics.elements.line import Line
+from geoptics.elements.rays import Ray
+from geoptics.elements.rays_batch import propagate_batch
+from geoptics.elements.vector import Point, Vector
+
+
+def test_propagate_batch(scene, region_polycurve_1):
+	# a fan of rays, some starting inside the region
+	# (with total internal reflections), some missing it
+	lines = [Line(Point(x0, y0), Vector(cos(theta), sin(theta)))
+	         for x0, y0 in [(10, 60), (10, 120), (90, 100), (200, 300)]
+	         for theta in np.linspace(-pi, pi, 25)]
+	parts = propagate_batch(scene,
+	                        [line.p.x for line in lines],
+	                        [line.p.y for line in lines],
+	                        [line.u.x for line in lines],
+	                        [line.u.y for line in lines],
+	                        )
+	for j, line in enumerate(lines):
+		ray = Ray(line0=line, s0=100)
+		ray.propagate(scene)
+		assert parts.count[j] == len(ray.parts)
+		for i, part in enumerate(ray.parts):
+			assert np.isclose(parts.px[i, j], part.line.p.x)
+			assert np.isclose(parts.py[i, j], part.line.p.y)
+			assert np.isclose(parts.ux[i, j], part.line.u.x)
+			assert np.isclose(parts.uy[i, j], part.line.u.y)
+			assert np.isclose(parts.s[i, j], part.s)
+			assert parts.n[i, j] == part.n
@@ -17,6 +17,15 @@
 # <http://www.gnu.org/licenses/>.
 
 
+from math import cos, radians, sin
+
+import pytest
+
+from geoptics.elements.line import Line
+from geoptics.elements.regions import Region
+from geoptics.elements.vector import Point, Vector
+
+
 def test_translate(scene, region_polycurve_1):
 	rp = region_polycurve_1
 	
@@ -47,3 +56,125 @@ def test_translate(scene, region_polycurve_1):
 	assert rp.curves[3].M1.y == 80
 	assert rp.curves[3].M2.x == 80
 	assert rp.curves[3].M2.y == 80
+
+
+@pytest.mark.parametrize("sign_of_s", [-1, 0, 1])
+def test_intersection_culling(scene, region_polycurve_1, sign_of_s):
+	rp = region_polycurve_1
+	for i in range(36):
+		angle = radians(10 * i + 1)
+		line = Line(Point(90, 100), Vector(cos(angle), sin(angle)))
+		# reference: all the curves, without bounding boxes
+		expected = [intersection[1]
+		            for curve in rp.curves
+		            for intersection in curve.intersection(line, sign_of_s)]
+		found = [intersection[1]
+		         for intersection in rp.intersection(line, sign_of_s)]
+		assert sorted(found) == sorted(expected)
+	# lines missing the region
+	line = Line(Point(0, 0), Vector(0, 1))
+	assert rp.intersection(line, sign_of_s) == []
+	# the bounding boxes follow the region
+	rp.translate(dx=-70, dy=0)
+	assert len(rp.intersection(line)) == 2
+
+
+@pytest.fixture()
+def polygon(scene):
+	"""Return a regular polygon, with many sides."""
+	sides = 64
+	region = scene.class_map['Regions']['Polycurve'](n=1.5, scene=scene)
+	region.start(Point(100, 0))
+	for i in range(1, sides):
+		angle = radians(360 * i / sides)
+		region.add_line(Point(100 * cos(angle), 100 * sin(angle)))
+	region.close()
+	return region
+
+
+def test_intersection_bvh(polygon):
+	# enough sides for a deep hierarchy
+	region = polygon
+	for i in range(50):
+		angle = radians(7.3 * i)
+		line = Line(Point(-150 + 6 * i, 20), Vector(cos(angle), sin(angle)))
+		expected = [intersection[1]
+		            for curve in region.curves
+		            for intersection in curve.intersection(line, 1)]
+		found = [intersection[1]
+		         for intersection in region.intersection_forward(line)]
+		assert sorted(found) == sorted(expected)
+		assert region.count_intersections(line) == len(expected)
+		nearest = region.intersection_nearest(line)
+		assert [intersection[1] for intersection in nearest] == (
+		        [min(expected)] if expected else [])
+		# both directions
+		expected = [intersection[1:]
+		            for curve in region.curves
+		            for intersection in curve.intersection(line)]
+		found = [intersection[1:] for intersection in region.intersection(line)]
+		assert len(found) == len(expected)
+		found.sort(key=lambda intersection: intersection[0])
+		expected.sort(key=lambda intersection: intersection[0])
+		for (s, eN, eT), (s_ref, eN_ref, eT_ref) in zip(found, expected):
+			assert s == s_ref
+			assert (eN.x, eN.y, eT.x, eT.y) == pytest.approx(
+			                       (eN_ref.x, eN_ref.y, eT_ref.x, eT_ref.y))
+
+
+def test_contains_polygon(polygon):
+	for x in range(-120, 121, 15):
+		for y in range(-120, 121, 15):
+			point = Point(x + 0.5, y + 0.25)
+			expected = Region.contains(polygon, point, Vector(1, 0))
+			# without direction, crossing number test
+			assert polygon.contains(point) == expected
+			assert polygon.contains(point, Vector(1, 0)) == expected
+	assert polygon.contains(Point(0, 0), Vector(0, 1))
+	assert not polygon.contains(Point(99, 99), Vector(0, 1))
+
+
+def test_contains_boundary(scene):
+	rectangle = scene.class_map['Regions']['Polycurve'](n=1.5, scene=scene)
+	rectangle.start(Point(70, 60))
+	rectangle.add_line(Point(70, 190))
+	rectangle.add_line(Point(110, 190))
+	rectangle.add_line(Point(110, 60))
+	rectangle.close()
+	# points on the boundary, looking inwards or outwards
+	for point, inwards in [(Point(110, 100), Vector(-1, 0)),
+	                       (Point(70, 100), Vector(1, 0)),
+	                       (Point(90, 190), Vector(0, -1)),
+	                       (Point(90, 60), Vector(0, 1))]:
+		outwards = Vector(-inwards.x, -inwards.y)
+		assert rectangle.contains(point, inwards)
+		assert not rectangle.contains(point, outwards)
+		assert rectangle.contains(line=Line(point, inwards))
+		assert not rectangle.contains(line=Line(point, outwards))
+	# without direction, same answer as along the x axis
+	for x, y in [(110, 100), (70, 100), (90, 190), (90, 60), (70, 60),
+	             (80, 190), (80, 60), (110, 190), (120, 190)]:
+		point = Point(x, y)
+		assert (rectangle.contains(point)
+		        == Region.contains(rectangle, point, Vector(1, 0)))
+
+
+def test_translate_arrays(scene, polygon):
+	# build the cached arrays
+	polygon.contains(Point(0, 0))
+	polygon.intersection(Line(Point(0, 0), Vector(1, 0)))
+	polygon.translate(dx=30, dy=-20)
+	fresh = type(polygon)(n=polygon.n, scene=scene)
+	fresh.start(polygon.curves[0].M1)
+	for curve in polygon.curves:
+		fresh.add_line(curve.M2)
+	for i in range(40):
+		angle = radians(9.1 * i)
+		line = Line(Point(-120 + 5 * i, -40 + 3 * i),
+		            Vector(cos(angle), sin(angle)))
+		assert polygon.contains(line=line) == fresh.contains(line=line)
+		found = sorted(intersection[1]
+		               for intersection in polygon.intersection(line))
+		expected = sorted(intersection[1]
+		                  for intersection in fresh.intersection(line))
+		assert found == pytest.approx(expected)
@@ -17,6 +17,14 @@
 # <http://www.gnu.org/licenses/>.
 
 
+import numpy as np
+
+import pytest
+
+from geoptics.elements.line import Line
+from geoptics.elements.vector import Point, Vector
+
+
 # config is tested in test_command_line.TestConfig
 # no need to test it here again
 
@@ -28,3 +36,91 @@ def test_add_config(scene, region_polycurve_1, source_singleray_1,
 	# the number of regions and sources should be doubled
 	assert len(scene.regions) == 2
 	assert len(scene.sources) == 4
+
+
+def test_add_single_item_config(scene, region_polycurve_1, source_beam_1):
+	scene.add(region_polycurve_1.config)
+	scene.add(source_beam_1.config)
+	assert len(scene.regions) == 2
+	assert len(scene.sources) == 2
+	with pytest.raises(KeyError):
+		scene.add({'Class': 'Unknown'})
+
+
+def test_region_at_contains_calls(scene, region_polycurve_1, monkeypatch):
+	# a second region, overlapping the first one
+	region_2 = scene.class_map['Regions']['Polycurve'].from_config(
+	                          region_polycurve_1.config, scene=scene)
+	cls = type(region_polycurve_1)
+	contains = cls.contains
+	tested = []
+	
+	def counting_contains(self, *args, **kwargs):
+		tested.append(self)
+		return contains(self, *args, **kwargs)
+	
+	monkeypatch.setattr(cls, 'contains', counting_contains)
+	# the first region found wins, the next ones are not tested
+	assert scene.region_at(Point(90, 100)) is region_polycurve_1
+	assert tested == [region_polycurve_1]
+	# outside both bounding boxes, nothing to test
+	del tested[:]
+	assert scene.region_at(Point(-500, 100)) is scene.background
+	assert tested == []
+	# the first region moved away, culled by its bounding box
+	region_polycurve_1.translate(dx=1000, dy=0)
+	del tested[:]
+	assert scene.region_at(Point(90, 100)) is region_2
+	assert tested == [region_2]
+
+
+def test_compile_propagator(scene, region_polycurve_1):
+	version = scene.version
+	propagator = scene.compile_propagator()
+	# cached as long as the regions do not change
+	assert scene.compile_propagator() is propagator
+	line = Line(Point(0, 100), Vector(1, 0))
+	assert len(propagator(line)) == 2
+	scene.remove(region_polycurve_1)
+	assert scene.version > version
+	assert scene.compile_propagator()(line) == []
+
+
+def test_intersect_all_batch(scene, region_polycurve_1):
+	px = np.array([0., 0.])
+	py = np.array([100., -1000.])
+	ux = np.array([1., 1.])
+	uy = np.array([0., 0.])
+	s, region_id, eNx, eNy, eTx, eTy = scene.intersect_all_batch(px, py,
+	                                                             ux, uy)
+	line = Line(Point(0, 100), Vector(1, 0))
+	s_min = min(intersection[1]
+	            for intersection in scene.compile_propagator()(line))
+	assert s[0] == pytest.approx(s_min)
+	assert region_id[0] == 0
+	# the second line misses the region
+	assert np.isinf(s[1])
+	assert region_id[1] == -1
+
+
+def test_compile_propagator_nearest(scene, region_polycurve_1):
+	propagator = scene.compile_propagator()
+	for y in (50, 100, 150, 1000):
+		line = Line(Point(0, y), Vector(1, 0.1))
+		intersections = propagator(line)
+		nearest = propagator(line, nearest_only=True)
+		if intersections:
+			(M, s, eN, eT), = nearest
+			assert s == min(intersection[1] for intersection in intersections)
+		else:
+			assert nearest == []
+
+
+def test_region_at_bbox(scene, region_polycurve_1):
+	# far from the region: culled by its bounding box
+	assert scene.region_at(Point(-500, 100)) is scene.background
+	assert scene.region_at(Point(90, 100)) is region_polycurve_1
+	# the bounding boxes follow the regions
+	region_polycurve_1.translate(dx=-590, dy=0)
+	assert scene.region_at(Point(-500, 100)) is region_polycurve_1
+	assert scene.region_at(Point(90, 100)) is scene.background
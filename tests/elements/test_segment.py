@@ -18,8 +18,10 @@
 
 import pytest
 
+from geoptics.elements._kernels import seg_line_intersect
+from geoptics.elements.line import Line
 from geoptics.elements.segment import Segment
-from geoptics.elements.vector import Point
+from geoptics.elements.vector import Point, Vector
 
 
 @pytest.fixture()
@@ -35,3 +37,58 @@ def test_config(segment):
 	assert segment_config['Class'] == 'Segment'
 	assert 'M1' in segment_config
 	assert 'M2' in segment_config
+
+
+@pytest.mark.parametrize("sign_of_s", [-1, 0, 1])
+def test_seg_line_intersect(segment, sign_of_s):
+	for p, u in [(Point(0, 50), Vector(1, 0)),
+	             (Point(100, 50), Vector(1, 0)),
+	             (Point(0, 0), Vector(1, 1)),
+	             (Point(0, 0), Vector(1, 2)),
+	             (Point(10, 0), Vector(0, 1))]:
+		line = Line(p, u)
+		hit, mx, my, s, eNx, eNy, eTx, eTy = seg_line_intersect(
+		    segment.M1.x, segment.M1.y, segment.M2.x, segment.M2.y,
+		    p.x, p.y, u.x, u.y, sign_of_s)
+		expected = segment.intersection(line, sign_of_s)
+		assert hit == bool(expected)
+		if hit:
+			M, s_ref, eN, eT = expected[0]
+			assert (mx, my, s) == pytest.approx((M.x, M.y, s_ref))
+			assert (eNx, eNy, eTx, eTy) == pytest.approx((eN.x, eN.y,
+			                                              eT.x, eT.y))
+
+
+def test_translate(segment):
+	"""Test that the cached quantities follow the end points."""
+	line = Line(Point(0, 25), Vector(1, 0))
+	assert segment.intersection(line)
+	segment.translate(dy=10)
+	assert not segment.intersection(line)
+	line = Line(Point(0, 35), Vector(1, 0))
+	(M, s, eN, eT), = segment.intersection(line)
+	assert (M.x, M.y) == pytest.approx((12.5, 35))
+
+
+@pytest.mark.parametrize("M1, M2", [(Point(10, 20), Point(10, 60)),
+                                    (Point(10, 60), Point(10, 20)),
+                                    (Point(10, 20), Point(50, 20)),
+                                    (Point(50, 20), Point(10, 20))])
+def test_intersection_axis_aligned(M1, M2):
+	segment = Segment(M1, M2)
+	for p, u in [(Point(0, 30), Vector(1, 0)),
+	             (Point(0, 30), Vector(0, 1)),
+	             (Point(0, 0), Vector(1, 1)),
+	             (Point(20, 100), Vector(-0.5, -2)),
+	             (Point(100, 100), Vector(1, 1))]:
+		line = Line(p, u)
+		for sign_of_s in (-1, 0, 1):
+			hit, mx, my, s, eNx, eNy, eTx, eTy = seg_line_intersect(
+			    M1.x, M1.y, M2.x, M2.y, p.x, p.y, u.x, u.y, sign_of_s)
+			result = segment.intersection(line, sign_of_s)
+			assert bool(result) == hit
+			if hit:
+				(M, s_ref, eN, eT), = result
+				assert (M.x, M.y, s_ref) == pytest.approx((mx, my, s))
+				assert (eN.x, eN.y, eT.x, eT.y) == pytest.approx(
+				        (eNx, eNy, eTx, eTy))
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 ederag <edera@gmx.fr>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GeOptics; see the file LICENSE.txt.  If not, see
+# <http://www.gnu.org/licenses/>.
+
+
+import inspect
+
+from geoptics.guis.qt.counterpart import _forwarder
+
+
+class G:
+	
+	def g_method(self, a, b=2, *args, c=3, d, **kwargs):
+		return (self, a, b, args, c, d, kwargs)
+	
+	def g_close(self):
+		return self
+
+
+class Element:
+	
+	g = G()
+
+
+def test_forwarder():
+	method = _forwarder(G.g_method, __name__)
+	assert method.__module__ == __name__
+	assert method.__code__.co_filename == "<g_overload G.g_method>"
+	assert (str(inspect.signature(method))
+	        == "(self, a, b=2, *args, c=3, d, **kwargs)")
+	e = Element()
+	assert method(e, 1, d=4) == (e.g, 1, 2, (), 3, 4, {})
+	assert method(e, 1, 5, 6, c=7, d=8, f=9) == (e.g, 1, 5, (6,), 7, 8,
+	                                             {'f': 9})
+	assert _forwarder(G.g_close, __name__)(e) is e.g
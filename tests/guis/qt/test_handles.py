@@ -17,13 +17,16 @@
 # <http://www.gnu.org/licenses/>.
 
 
-from PyQt5.QtWidgets import QGraphicsRectItem
+from PyQt5.QtWidgets import QGraphicsRectItem, QGraphicsView
 
 import pytest
 
 from geoptics.elements.line import Line
 from geoptics.elements.vector import Point, Vector
-from geoptics.guis.qt.handles import LineHandle
+from geoptics.guis.qt import sources
+from geoptics.guis.qt.handles import LineHandle, PointHandle
+from geoptics.guis.qt.scene import FULL_UPDATE_HANDLES
+from geoptics.guis.qt.view import GraphicsView
 
 
 @pytest.fixture
@@ -42,3 +45,90 @@ def test_create_line_handle(scene, parent_item):
 	lh = LineHandle(line0, parent=parent_item)
 	assert lh.h_p0.pos().x() == 10
 	assert lh.h_p0.pos().y() == 20
+
+
+def test_viewport_update_mode(scene, parent_item):
+	view = GraphicsView()
+	view.setScene(scene.g)
+	line0 = Line(Point(10, 20), Vector(30, 60))
+	handles = [LineHandle(line0, parent=parent_item)
+	           for _ in range(FULL_UPDATE_HANDLES)]
+	for handle in handles:
+		handle.setVisible(True)
+	assert view.viewportUpdateMode() == QGraphicsView.FullViewportUpdate
+	handles[0].setVisible(False)
+	assert view.viewportUpdateMode() == view.default_viewport_update_mode
+
+
+def test_u_moved(scene, parent_item):
+	line0 = Line(Point(10, 20), Vector(2, 0))
+	lh = LineHandle(line0, parent=parent_item)
+	# no active view, view and scene coordinates are the same
+	assert (lh.u_view.x(), lh.u_view.y()) == (50, 0)
+	lh.u_moved(0, 50)
+	assert (lh.u_view.x(), lh.u_view.y()) == (50, 50)
+	assert (lh.line.u.x, lh.line.u.y) == pytest.approx((2 ** -0.5, 2 ** -0.5))
+
+
+def test_line_handle_slots(scene, parent_item):
+	lh = LineHandle(Line(Point(10, 20), Vector(30, 60)), parent=parent_item)
+	assert not hasattr(lh, '__dict__')
+	with pytest.raises(AttributeError):
+		lh.foo = 1
+
+
+def test_point_handle_scene(scene, parent_item):
+	# parent given to the constructor
+	handle = PointHandle(parent=parent_item)
+	assert handle._scene_wr() is scene.g
+	scene.g.removeItem(parent_item)
+	assert handle._scene_wr() is None
+	scene.g.addItem(parent_item)
+	assert handle._scene_wr() is scene.g
+
+
+class Recorder:
+	
+	def __init__(self):
+		self.received = []
+	
+	def slot(self, line):
+		self.received.append(line.copy())
+
+
+def test_set_line(scene, parent_item):
+	lh = LineHandle(Line(Point(10, 20), Vector(2, 0)), parent=parent_item)
+	recorder = Recorder()
+	lh.signal_moved.connect(recorder.slot)
+	moved = recorder.received
+	scene.g.move_restrictions_on = True
+	lh.set_line(Line(Point(30, 50), Vector(0, 1)))
+	# free of move restrictions, and silent
+	assert (lh.h_p0.pos().x(), lh.h_p0.pos().y()) == (30, 50)
+	assert (lh.u_view.x(), lh.u_view.y()) == (0, 50)
+	assert (lh.line.p.x, lh.line.p.y) == (30, 50)
+	assert moved == []
+	# still connected to the point handles
+	lh.h_p0.setPos(40, 50)
+	assert len(moved) == 1
+	assert (moved[0].p.x, moved[0].p.y) == (40, 50)
+
+
+def test_select_all_viewport_update_mode(gui):
+	scene = gui.scene
+	view = gui.view
+	# two line handles per beam
+	for i in range(FULL_UPDATE_HANDLES // 2):
+		sources.Beam(line_start=Line(Point(0, 10 * i), Vector(1, 0)),
+		             line_end=Line(Point(0, 10 * i + 5), Vector(1, 0)),
+		             scene=scene)
+	# the handles are created by the first selection
+	gui.select_all()
+	assert view.viewportUpdateMode() == QGraphicsView.FullViewportUpdate
+	scene.g.signal_set_all_selected.emit(False)
+	assert view.viewportUpdateMode() == view.default_viewport_update_mode
+	gui.select_all()
+	assert view.viewportUpdateMode() == QGraphicsView.FullViewportUpdate
+	# removing a source removes its visible handles
+	scene.remove(scene.sources[0])
+	assert view.viewportUpdateMode() == view.default_viewport_update_mode
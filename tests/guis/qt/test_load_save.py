@@ -16,9 +16,12 @@
 # along with GeOptics; see the file LICENSE.txt.  If not, see
 # <http://www.gnu.org/licenses/>.
 
+import io
 import logging
 logger = logging.getLogger(__name__)   # noqa: E402
 
+import yaml
+
 from geoptics.guis.qt.debug import check_source_rays_consistency
 
 
@@ -28,6 +31,11 @@ def test_load_fine(gui):
 	scene = gui.scene
 	assert len(scene.regions) == 1
 	assert len(scene.sources) == 2
+	# rays drawn once, at the end of the load
+	assert not scene.g.drawing_suspended
+	for source in scene.sources:
+		for ray in source.rays:
+			assert ray.g.path().elementCount() == len(ray.parts) + 1
 
 
 def test_load_wrong(gui):
@@ -70,3 +78,10 @@ def test_import(gui):
 	gui.load_file(filename, reset_scene=False)
 	assert len(scene.regions) == 3
 	assert len(scene.sources) == 5
+
+
+def test_dump_load(gui):
+	gui.load_file("tests/polycurve+beam+single_ray.geoptics")
+	stream = io.StringIO()
+	gui.dump(stream)
+	assert yaml.safe_load(stream.getvalue()) == {'Scene': gui.scene.config}
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 ederag <edera@gmx.fr>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GeOptics; see the file LICENSE.txt.  If not, see
+# <http://www.gnu.org/licenses/>.
+
+
+from PyQt5.QtCore import QEvent, QPoint, QPointF, Qt
+from PyQt5.QtGui import QMouseEvent
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+from geoptics.guis.qt.view import GraphicsView
+
+
+def test_moves_coalesced(scene):
+	g_scene = scene.g
+	view = GraphicsView()
+	view.setScene(g_scene)
+	view.show()
+	positions = []
+	g_scene.signal_mouse_position_changed.connect(
+	    lambda x, y: positions.append((x, y)))
+	moved = []
+	g_scene.signal_element_moved.connect(lambda: moved.append(True))
+	for x in range(5):
+		# as if an item had been moved
+		g_scene.move_id += 1
+		QTest.mouseMove(view.viewport(), QPoint(10 + x, 10))
+	# nothing emitted before the timer expires
+	assert positions == []
+	assert moved == []
+	g_scene._move_timer.stop()
+	g_scene._flush_move()
+	# only the last position
+	last = view.mapToScene(QPoint(14, 10))
+	assert positions == [(last.x(), last.y())]
+	assert moved == [True]
+	# nothing pending anymore
+	g_scene._flush_move()
+	assert len(positions) == 1
+
+
+def test_pan_coalesced(scene):
+	view = GraphicsView()
+	view.setScene(scene.g)
+	view.show()
+	viewport = view.viewport()
+	dx0 = view.transform().dx()
+	QTest.mousePress(viewport, Qt.MiddleButton, pos=QPoint(10, 10))
+	for x in range(11, 16):
+		move = QMouseEvent(QEvent.MouseMove, QPointF(x, 10),
+		                   Qt.NoButton, Qt.MiddleButton, Qt.NoModifier)
+		QApplication.sendEvent(viewport, move)
+	# not translated yet
+	assert view.transform().dx() == dx0
+	QTest.mouseRelease(viewport, Qt.MiddleButton, pos=QPoint(15, 10))
+	# translated once, by the whole displacement
+	assert view.transform().dx() == dx0 + 5
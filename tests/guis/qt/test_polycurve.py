@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 ederag <edera@gmx.fr>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GeOptics; see the file LICENSE.txt.  If not, see
+# <http://www.gnu.org/licenses/>.
+
+
+from geoptics.elements.vector import Point, Vector
+from geoptics.guis.qt import regions
+
+
+def path_elements(item):
+	path = item.path()
+	return [(path.elementAt(i).x, path.elementAt(i).y, path.elementAt(i).type)
+	        for i in range(path.elementCount())]
+
+
+def test_from_config_batch(scene):
+	region = regions.Polycurve(n=1.5, scene=scene)
+	region.start(Point(70, 60))
+	region.add_line(Point(70, 190))
+	region.add_line(Point(110, 190))
+	region.add_arc(Point(110, 60), Vector(10, -20))
+	region.close()
+	loaded = regions.Polycurve.from_config(region.config, scene=scene)
+	# the curves are added in a batch, the path must be the same
+	assert loaded.g._pending_path is None
+	assert path_elements(loaded.g) == path_elements(region.g)
+
+
+def test_move_restrictions(scene):
+	region = regions.Polycurve(n=1.5, scene=scene)
+	region.start(Point(70, 60))
+	region.add_line(Point(70, 190))
+	region.add_line(Point(110, 190))
+	region.close()
+	scene.g.move_restrictions_on = True
+	region.g.reset_move()
+	# mostly along x, the y displacement is dropped
+	region.g.setPos(90, 65)
+	assert (region.g.pos().x(), region.g.pos().y()) == (90, 60)
+	assert (region.curves[0].M1.x, region.curves[0].M1.y) == (90, 60)
+	# now mostly along y, relative to the beginning of the move
+	region.g.setPos(75, 90)
+	assert (region.g.pos().x(), region.g.pos().y()) == (70, 90)
+	assert (region.curves[0].M1.x, region.curves[0].M1.y) == (70, 90)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 ederag <edera@gmx.fr>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GeOptics; see the file LICENSE.txt.  If not, see
+# <http://www.gnu.org/licenses/>.
+
+
+from geoptics.elements.line import Line
+from geoptics.elements.vector import Point, Vector
+from geoptics.guis.qt import sources
+
+
+def path_points(item):
+	path = item.path()
+	return [(path.elementAt(i).x, path.elementAt(i).y)
+	        for i in range(path.elementCount())]
+
+
+def test_draw_moved(scene):
+	# single part ray, the path must follow its beginning
+	source = sources.SingleRay(line0=Line(Point(10, 20), Vector(1, 0)),
+	                           s0=30, scene=scene)
+	ray = source.rays[0]
+	assert path_points(ray.g) == [(10, 20), (40, 20)]
+	source.move_p0(5, 0)
+	ray.draw()
+	assert path_points(ray.g) == [(15, 20), (45, 20)]
+
+
+def test_shape_follows_path(scene):
+	source = sources.SingleRay(line0=Line(Point(10, 20), Vector(1, 0)),
+	                           s0=30, scene=scene)
+	ray = source.rays[0]
+	assert ray.g.shape().boundingRect().center().x() == 25
+	source.move_p0(5, 0)
+	ray.draw()
+	assert ray.g.shape().boundingRect().center().x() == 30
+
+
+def test_source_shape_follows_rays(scene):
+	source = sources.SingleRay(line0=Line(Point(10, 20), Vector(1, 0)),
+	                           s0=30, scene=scene)
+	assert source.g.shape().boundingRect().center().x() == 25
+	source.move_p0(5, 0)
+	source.rays[0].draw()
+	assert source.g.shape().boundingRect().center().x() == 30
+
+
+def test_source_bounding_rect_follows_rays(scene):
+	source = sources.SingleRay(line0=Line(Point(10, 20), Vector(1, 0)),
+	                           s0=30, scene=scene)
+	assert source.g.boundingRect().center().x() == 25
+	source.move_p0(5, 0)
+	source.rays[0].draw()
+	assert source.g.boundingRect().center().x() == 30
+
+
+def test_source_bounding_rect_selected(scene):
+	source = sources.SingleRay(line0=Line(Point(10, 20), Vector(1, 0)),
+	                           s0=30, scene=scene)
+	ray_rect = source.rays[0].g.boundingRect()
+	assert source.g.boundingRect() == ray_rect
+	# the line handles are created, they do not change the rect
+	source.g.setSelected(True)
+	assert source.g.boundingRect() == ray_rect
+	source.move_p0(5, 0)
+	source.rays[0].draw()
+	assert source.g.boundingRect() == source.rays[0].g.boundingRect()
+	assert source.g.boundingRect().center().x() == 30
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 ederag <edera@gmx.fr>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GeOptics; see the file LICENSE.txt.  If not, see
+# <http://www.gnu.org/licenses/>.
+
+
+import pytest
+
+from geoptics.guis.qt.signal import Signal
+
+
+class Slots:
+	
+	def __init__(self):
+		self.received = []
+	
+	def slot(self, *args):
+		self.received.append(args)
+
+
+def test_emit_disconnect():
+	signal = Signal()
+	slots = Slots()
+	signal.connect(slots.slot)
+	signal.emit(1, 2)
+	assert slots.received == [(1, 2)]
+	signal.disconnect(slots.slot)
+	signal.emit(3)
+	assert slots.received == [(1, 2)]
+
+
+def test_connect_in_slot():
+	signal = Signal()
+	slots = Slots()
+	other = Slots()
+	
+	class Connecting:
+		def slot(self):
+			signal.connect(other.slot)
+	
+	connecting = Connecting()
+	signal.connect(connecting.slot)
+	signal.connect(slots.slot)
+	signal.emit()
+	assert slots.received == [()]
+	# connected during the previous emit, called from the next one only
+	assert other.received == []
+	signal.emit()
+	assert other.received == [()]
+
+
+def test_dead_subscriber():
+	signal = Signal()
+	slots = Slots()
+	signal.connect(slots.slot)
+	del slots
+	with pytest.raises(ReferenceError, match="Slots.slot"):
+		signal.emit()
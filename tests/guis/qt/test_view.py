@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 ederag <edera@gmx.fr>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GeOptics; see the file LICENSE.txt.  If not, see
+# <http://www.gnu.org/licenses/>.
+
+
+from geoptics.guis.qt.view import GraphicsView
+
+
+def test_map_vector_scaled(qapp):
+	view = GraphicsView()
+	# the y axis is inverted
+	assert view.map_vector_from_scene(3, 4) == (3, -4)
+	view.scale(2, 4)
+	assert view.map_vector_from_scene(3, 4) == (6, -16)
+	assert view.map_vector_to_scene(6, -16) == (3, 4)
+	view.resetTransform()
+	assert view.map_vector_to_scene(3, 4) == (3, 4)
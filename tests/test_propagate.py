@@ -17,6 +17,12 @@
 # <http://www.gnu.org/licenses/>.
 
 
+import pytest
+
+from geoptics.elements.line import Line
+from geoptics.elements.vector import Point, Vector
+
+
 def test_propagate_nothing(scene):
 	"""Test the totally empty scene case."""
 	scene.propagate()
@@ -34,3 +40,119 @@ def test_propagate(scene, region_polycurve_1, source_singleray_1):
 	assert len(ray.parts) == 4
 	# last part should be outside
 	assert ray.parts[-1].n == scene.background.n
+
+
+def test_propagate_normal_incidence(scene, region_polycurve_1):
+	"""Test the normal incidence case (no deviation)."""
+	source = scene.class_map['Sources']['SingleRay'](
+	                 line0=Line(Point(0, 100), Vector(1, 0)), s0=10, scene=scene)
+	scene.propagate()
+	ray = source.rays[0]
+	assert ray.parts[0].s == pytest.approx(70)
+	u = ray.parts[1].line.u
+	assert (u.x, u.y) == pytest.approx((1, 0))
+	assert ray.parts[1].n == region_polycurve_1.n
+
+
+def test_propagate_boundary_start(scene):
+	"""Test a ray starting on a region boundary, towards the inside."""
+	region = scene.class_map['Regions']['Polycurve'](n=1.5, scene=scene)
+	region.start(Point(70, 60))
+	region.add_line(Point(70, 190))
+	region.add_line(Point(110, 190))
+	region.add_line(Point(110, 60))
+	region.close()
+	line0 = Line(Point(110, 100), Vector(-1, 0))
+	source = scene.class_map['Sources']['SingleRay'](line0=line0, s0=10,
+	                                                 scene=scene)
+	scene.propagate()
+	ray = source.rays[0]
+	assert len(ray.parts) == 2
+	assert ray.parts[0].n == region.n
+	assert ray.parts[0].s == pytest.approx(40)
+	assert ray.parts[1].line.p.x == pytest.approx(70)
+	assert ray.parts[1].n == scene.background.n
+
+
+def test_propagate_cache(scene, region_polycurve_1, source_singleray_1):
+	"""Test that propagation results are reused until the scene changes."""
+	scene.propagate()
+	ray = source_singleray_1.rays[0]
+	config = ray.config
+	scene.propagate()
+	assert ray.config == config
+	# moving the region must invalidate the cached parts
+	region_polycurve_1.translate(dx=5, dy=0)
+	scene.propagate()
+	assert ray.config != config
+	# as well as changing its index
+	config = ray.config
+	region_polycurve_1.n = 1.2
+	scene.propagate()
+	assert ray.parts[1].n == 1.2
+	assert ray.config != config
+
+
+def add_rectangle(scene, xmin, ymin, xmax, ymax, n):
+	"""Add a rectangular Polycurve region to the scene."""
+	region = scene.class_map['Regions']['Polycurve'](n=n, scene=scene)
+	region.start(Point(xmin, ymin))
+	region.add_line(Point(xmin, ymax))
+	region.add_line(Point(xmax, ymax))
+	region.add_line(Point(xmax, ymin))
+	region.close()
+	return region
+
+
+def add_beam(scene, p_start, u_start, p_end, u_end):
+	"""Add a Beam source to the scene."""
+	return scene.class_map['Sources']['Beam'](
+	           line_start=Line(p_start, u_start), s_start=10,
+	           line_end=Line(p_end, u_end), s_end=10,
+	           N_inter=7, scene=scene)
+
+
+def boundary_start(scene):
+	"""Rays starting on a region boundary, towards the inside."""
+	add_rectangle(scene, 70, 60, 110, 190, n=1.5)
+	return add_beam(scene, Point(110, 70), Vector(-1, 0.5),
+	                Point(110, 180), Vector(-1, -0.5))
+
+
+def shared_edge(scene):
+	"""Rays crossing a shared edge, or grazing along region sides."""
+	add_rectangle(scene, 70, 60, 110, 190, n=1.5)
+	add_rectangle(scene, 110, 60, 150, 190, n=1.2)
+	return add_beam(scene, Point(0, 60), Vector(1, 0),
+	                Point(0, 190), Vector(1, 0))
+
+
+def overlapping(scene):
+	"""Rays across overlapping regions."""
+	add_rectangle(scene, 70, 60, 110, 190, n=1.5)
+	add_rectangle(scene, 90, 100, 150, 220, n=1.2)
+	return add_beam(scene, Point(0, 80), Vector(1, 0.3),
+	                Point(0, 200), Vector(1, -0.1))
+
+
+@pytest.mark.parametrize("build", [None, boundary_start, shared_edge,
+                                   overlapping])
+def test_propagate_batch(scene, region_polycurve_1, source_beam_1, build):
+	"""Test that a beam propagated at once matches the ray by ray result."""
+	if build is None:
+		beam = source_beam_1
+	else:
+		scene.remove(region_polycurve_1)
+		scene.remove(source_beam_1)
+		beam = build(scene)
+	scene.propagate()
+	batch = [[(part.line.p.x, part.line.p.y, part.line.u.x, part.line.u.y,
+	           part.s, part.n) for part in ray.parts]
+	         for ray in beam.rays]
+	scene.propagate(rays=beam.rays)
+	for ray, parts in zip(beam.rays, batch):
+		assert len(ray.parts) == len(parts)
+		for part, values in zip(ray.parts, parts):
+			assert values == pytest.approx(
+			    (part.line.p.x, part.line.p.y, part.line.u.x, part.line.u.y,
+			     part.s, part.n))